@@ -6,162 +6,168 @@ from PyQt6.QtCore import QUrl, Qt, QThread, pyqtSignal
 from PyQt6.QtGui import QPixmap , QPalette, QColor
 import os
 import sys
-from PIL import Image
-from pydub import AudioSegment
-import moviepy.editor as mp
-from pathlib import Path
-from svglib.svglib import svg2rlg
-from reportlab.graphics import renderPM
-from io import BytesIO
-import subprocess
-import tempfile
+from cache import ConversionCache
+from converter import SUPPORTED_FORMATS, MediaConverter, build_target_path, detect_media_type
+from proxies import ProxyCache
+from scheduler import ResourceBudget, estimate_cost
+from thumbnails import ThumbnailCache
 
 
 class ConversionWorker(QThread):
     progress = pyqtSignal(int)
     finished = pyqtSignal(bool, str) 
-    def __init__(self, source_file, target_format, file_type):
+    def __init__(self, source_file, target_format, file_type, cache=None):
         super().__init__()
         self.source_file = source_file
         self.target_format = target_format
         self.file_type = file_type   
+        self.converter = MediaConverter(progress_callback=self.progress.emit, cache=cache)
     def run(self):
         try:
-            source_path = Path(self.source_file)
-            target_path = source_path.parent / f"{source_path.stem}_converted{self.target_format}"
-            if self.file_type == 'resim':
-                self.convert_image(source_path, target_path)
-            elif self.file_type == 'ses':
-                self.convert_audio(source_path, target_path)
-            elif self.file_type == 'video':
-                self.convert_video(source_path, target_path)   
+            # Tür tespiti ffprobe çalıştırabildiği için arayüz iş parçacığında değil burada yapılır
+            if detect_media_type(self.source_file) not in (self.file_type, None):
+                raise Exception("Dosya türü seçilen dönüşüm tipine uymuyor.")
+            target_path = build_target_path(self.source_file, self.target_format)
+            self.converter.convert(self.source_file, target_path, self.file_type)
             self.finished.emit(True, str(target_path))
         except Exception as e:
             self.finished.emit(False, str(e))
-    
-    def convert_image(self, source_path, target_path):
+    def cancel(self):
+        self.converter.cancel()
+
+class ConversionJob(object):
+    def __init__(self, job_id, source_file, target_format, file_type, priority=0):
+        self.job_id = job_id
+        self.source_file = source_file
+        self.target_format = target_format
+        self.file_type = file_type
+        self.priority = priority
+        self.cost = estimate_cost(source_file, file_type)
+        self.state = 'Bekliyor'
+        self.progress = 0
+        self.message = ''
+        self.worker = None
+        self.cancel_requested = False
+
+class ConversionQueue(QtCore.QObject):
+    job_changed = pyqtSignal(object)
+    def __init__(self, cache=None, budget=None):
+        super().__init__()
+        self.cache = cache
+        self.budget = budget or ResourceBudget()
+        self.pending = []
+        self.running = {}
+        self.next_id = 1
+    def add(self, source_file, target_format, file_type, priority=0):
+        job = ConversionJob(self.next_id, source_file, target_format, file_type, priority)
+        self.next_id += 1
+        self.pending.append(job)
+        self.job_changed.emit(job)
+        self.schedule()
+        return job
+    def schedule(self):
+        self.pending.sort(key=lambda job: (-job.priority, job.job_id))
+        for job in list(self.pending):
+            # Hiç iş çalışmıyorsa bütçeyi aşan büyük işler de başlatılır
+            if self.running and not self.budget.fits(job.cost):
+                continue
+            self.pending.remove(job)
+            self.start(job)
+    def start(self, job):
+        self.budget.acquire(job.cost)
+        job.worker = ConversionWorker(job.source_file, job.target_format, job.file_type, self.cache)
+        job.worker.progress.connect(lambda value, job=job: self.job_progress(job, value))
+        job.worker.finished.connect(lambda success, message, job=job: self.job_finished(job, success, message))
+        job.state = 'Çalışıyor'
+        self.running[job.job_id] = job
+        job.worker.start()
+        self.job_changed.emit(job)
+    def cancel(self, job):
+        if job in self.pending:
+            self.pending.remove(job)
+            job.state = 'İptal edildi'
+            self.job_changed.emit(job)
+        elif job.job_id in self.running:
+            job.cancel_requested = True
+            job.state = 'İptal ediliyor'
+            job.worker.cancel()
+            self.job_changed.emit(job)
+    def job_progress(self, job, value):
+        job.progress = value
+        self.job_changed.emit(job)
+    def job_finished(self, job, success, message):
+        self.budget.release(job.cost)
+        del self.running[job.job_id]
+        job.worker.wait()
+        job.worker = None
+        job.message = message
+        if success:
+            job.state = 'Tamamlandı'
+            job.progress = 100
+        elif job.cancel_requested:
+            job.state = 'İptal edildi'
+        else:
+            job.state = 'Hata'
+        self.job_changed.emit(job)
+        self.schedule()
+
+class DetectWorker(QThread):
+    ready = pyqtSignal(str, object)
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+    def run(self):
         try:
-            source_ext = source_path.suffix.lower()
-            target_ext = Path(target_path).suffix.lower()
-            if source_ext == '.svg':
-                drawing = svg2rlg(str(source_path))
-                temp_buffer = BytesIO()
-                renderPM.drawToFile(drawing, temp_buffer, fmt="PNG")
-                temp_buffer.seek(0)
-                img = Image.open(temp_buffer)
-            else:
-                img = Image.open(source_path)
-            if target_ext == '.avif':
-                if img.mode in ['RGBA', 'P']:
-                    img = img.convert('RGB')
-            elif target_ext in ['.jpg', '.jpeg']:
-                if img.mode in ['RGBA', 'P']:
-                    img = img.convert('RGB')   
-            self.progress.emit(50)
-            if target_ext == '.avif':
-                img.save(target_path, format='avif', quality=75)
-            elif target_ext == '.svg':
-                raise Exception("SVG formatına dönüştürme desteklenmiyor. Lütfen başka bir format seçin.")
-            else:
-                img.save(target_path)
-            self.progress.emit(100)
-        except Exception as e:
-            raise Exception(f"Resim dönüştürme hatası: {str(e)}")
-    
-    def convert_audio(self, source_path, target_path):
+            file_type = detect_media_type(self.file_path)
+        except Exception:
+            file_type = None
+        self.ready.emit(self.file_path, file_type)
+
+class ThumbnailWorker(QThread):
+    ready = pyqtSignal(str, bytes)
+    def __init__(self, file_path, thumbnail_cache):
+        super().__init__()
+        self.file_path = file_path
+        self.thumbnail_cache = thumbnail_cache
+    def run(self):
         try:
-            target_ext = Path(target_path).suffix.lower()          
-            if target_ext in ['.wma', '.m4a']:
-                try:
-                    subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-                except (subprocess.CalledProcessError, FileNotFoundError):
-                    raise Exception("Bu dönüşüm için ffmpeg gerekli. Lütfen sisteminize ffmpeg yükleyin.")
-                with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as temp_file:
-                    temp_path = temp_file.name
-                audio = AudioSegment.from_file(str(source_path))
-                audio.export(temp_path, format='wav')
-                if target_ext == '.wma':
-                    codec = 'wmav2'
-                else:  # .m4a
-                    codec = 'aac'
-                try:
-                    duration_cmd = ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-                                  '-of', 'default=noprint_wrappers=1:nokey=1', temp_path]
-                    duration = float(subprocess.check_output(duration_cmd).decode().strip())
-                    cmd = [
-                        'ffmpeg', '-i', temp_path,
-                        '-acodec', codec,
-                        '-y', 
-                        str(target_path)
-                    ]
-                    process = subprocess.Popen(
-                        cmd,
-                        stderr=subprocess.PIPE,
-                        universal_newlines=True
-                    )
-                    for line in process.stderr:
-                        if "time=" in line:
-                            try:
-                                time_str = line.split("time=")[1].split()[0]
-                                hours, minutes, seconds = map(float, time_str.split(':'))
-                                current_time = hours * 3600 + minutes * 60 + seconds
-                                progress = int((current_time / duration) * 100)
-                                self.progress.emit(min(progress, 99))
-                            except:
-                                continue
-                    process.wait()
-                    if process.returncode != 0:
-                        raise Exception("FFmpeg dönüşüm hatası")             
-                finally:
-                    try:
-                        os.remove(temp_path)
-                    except:
-                        pass
-                self.progress.emit(100)
-            else:
-                audio = AudioSegment.from_file(str(source_path))
-                duration = len(audio)
-                chunk_size = duration // 10
-                for i in range(0, duration, chunk_size):
-                    chunk = audio[i:i + chunk_size]
-                    progress = int((i / duration) * 90)
-                    self.progress.emit(progress)
-                format_name = target_ext.replace('.', '')
-                audio.export(target_path, format=format_name)
-                self.progress.emit(100)
-        except Exception as e:
-            raise Exception(f"Ses dönüşümü hatası: {str(e)}")
-        
-    def convert_video(self, source_path, target_path):
+            data = self.thumbnail_cache.get(self.file_path)
+        except Exception:
+            data = b''
+        self.ready.emit(self.file_path, data)
+
+class ProxyWorker(QThread):
+    ready = pyqtSignal(str, str, object)
+    def __init__(self, file_path, proxy_cache):
+        super().__init__()
+        self.file_path = file_path
+        self.proxy_cache = proxy_cache
+    def run(self):
         try:
-            video = mp.VideoFileClip(str(source_path))
-            duration = video.duration
-            output_ext = os.path.splitext(target_path)[1].lower()
-            if output_ext == '.webm':
-                video.write_videofile(
-                    str(target_path),
-                    codec='libvpx',  
-                    audio_codec='libvorbis', 
-                    verbose=False,
-                    logger=None
-                )
-            else:
-                video.write_videofile(
-                    str(target_path),
-                    codec='libx264',
-                    audio_codec='aac',
-                    verbose=False,
-                    logger=None
-                )
-            self.progress.emit(100)
-            video.close()
-        except Exception as e:
-            raise Exception(f"Video dönüştürme hatası: {str(e)}")
+            proxy_path, sprite = self.proxy_cache.get(self.file_path)
+            self.ready.emit(self.file_path, str(proxy_path), sprite)
+        except Exception:
+            self.ready.emit(self.file_path, '', None)
+
+class PreviewSlider(QSlider):
+    hovered = pyqtSignal(int, int)
+    left = pyqtSignal()
+    def __init__(self, orientation, parent=None):
+        super().__init__(orientation, parent)
+        self.setMouseTracking(True)
+    def mouseMoveEvent(self, event):
+        x = int(event.position().x())
+        value = QtWidgets.QStyle.sliderValueFromPosition(self.minimum(), self.maximum(), x, self.width())
+        self.hovered.emit(value, x)
+        super().mouseMoveEvent(event)
+    def leaveEvent(self, event):
+        self.left.emit()
+        super().leaveEvent(event)
 
 class Ui_Form(object):
     def setupUi(self, Form):
         Form.setObjectName("Form")
-        Form.resize(442, 741)
+        Form.resize(442, 951)
         self.media_frame = QFrame(parent=Form)
         self.media_frame.setGeometry(QtCore.QRect(20, 20, 401, 301))
         self.media_frame.setFrameShape(QFrame.Shape.StyledPanel)
@@ -180,7 +186,7 @@ class Ui_Form(object):
         self.stop_button = QtWidgets.QPushButton("⏹")
         self.play_button.setFixedSize(30, 30)
         self.stop_button.setFixedSize(30, 30)
-        self.progress_slider = QSlider(Qt.Orientation.Horizontal)
+        self.progress_slider = PreviewSlider(Qt.Orientation.Horizontal)
         self.progress_slider.setMinimum(0)
         self.progress_slider.setMaximum(100)
         self.volume_slider = QSlider(Qt.Orientation.Horizontal)
@@ -202,6 +208,13 @@ class Ui_Form(object):
         self.audio_output = QAudioOutput()
         self.media_player.setVideoOutput(self.video_widget)
         self.media_player.setAudioOutput(self.audio_output)
+        self.sprite_label = QLabel(parent=Form)
+        self.sprite_label.setFrameShape(QFrame.Shape.Box)
+        self.sprite_label.hide()
+        self.proxy_cache = ProxyCache()
+        self.proxy_workers = []
+        self.sprite_info = None
+        self.sprite_pixmap = None
         self.image_label = QLabel(self.media_frame)
         self.image_label.setGeometry(0, 0, 401, 301)
         self.image_label.setAlignment(QtCore.Qt.AlignmentFlag.AlignCenter)
@@ -282,11 +295,32 @@ class Ui_Form(object):
         self.sonuc_mesaji_label = QtWidgets.QLabel(parent=Form)
         self.sonuc_mesaji_label.setGeometry(QtCore.QRect(20, 620 + offset, 281, 41))
         self.sonuc_mesaji_label.setObjectName("sonuc_mesaji_label")
-        self.SUPPORTED_FORMATS = {
-            'ses': ['.mp3', '.wav', '.ogg', '.aac', '.wma', '.m4a', '.flac'],
-            'video': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm'],
-            'resim': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.svg', '.avif']
-        }
+        self.oncelik_spinbox = QtWidgets.QSpinBox(parent=Form)
+        self.oncelik_spinbox.setGeometry(QtCore.QRect(160, 520 + offset, 91, 31))
+        self.oncelik_spinbox.setRange(0, 9)
+        self.oncelik_spinbox.setObjectName("oncelik_spinbox")
+        self.kuyruk_listesi = QtWidgets.QTreeWidget(parent=Form)
+        self.kuyruk_listesi.setGeometry(QtCore.QRect(20, 670 + offset, 401, 171))
+        self.kuyruk_listesi.setColumnCount(5)
+        self.kuyruk_listesi.setRootIsDecorated(False)
+        self.kuyruk_listesi.setSelectionMode(QtWidgets.QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.kuyruk_listesi.setColumnWidth(0, 140)
+        self.kuyruk_listesi.setColumnWidth(1, 50)
+        self.kuyruk_listesi.setColumnWidth(2, 50)
+        self.kuyruk_listesi.setColumnWidth(3, 90)
+        self.kuyruk_listesi.setObjectName("kuyruk_listesi")
+        self.iptalbutonu = QtWidgets.QPushButton(parent=Form)
+        self.iptalbutonu.setGeometry(QtCore.QRect(330, 850 + offset, 91, 31))
+        self.iptalbutonu.setObjectName("iptalbutonu")
+        self.SUPPORTED_FORMATS = SUPPORTED_FORMATS
+        self.thumbnail_cache = ThumbnailCache()
+        self.thumbnail_workers = []
+        self.detect_workers = []
+        self.selected_files = []
+        self.jobs = {}
+        self.job_items = {}
+        self.conversion_queue = ConversionQueue(ConversionCache())
+        self.conversion_queue.job_changed.connect(self.update_job_row)
         self.setup_initial_state()
         self.setup_connections()
         self.setup_media_connections()
@@ -306,6 +340,12 @@ class Ui_Form(object):
         self.label_5.setText(_translate("Form", "Mevcut dosya formatı :"))
         self.format_adi_labeli.setText(_translate("Form", "format adı"))
         self.baslatbutonu.setText(_translate("Form", "BAŞLAT"))
+        self.oncelik_spinbox.setPrefix(_translate("Form", "Öncelik "))
+        self.kuyruk_listesi.setHeaderLabels([
+            _translate("Form", "Dosya"), _translate("Form", "Format"), _translate("Form", "Öncelik"),
+            _translate("Form", "Durum"), _translate("Form", "İlerleme")
+        ])
+        self.iptalbutonu.setText(_translate("Form", "İPTAL"))
         self.sonuc_mesaji_label.setText(_translate("Form", ""))
 
     def setup_initial_state(self):
@@ -330,6 +370,8 @@ class Ui_Form(object):
         self.media_player.durationChanged.connect(self.update_duration)
         self.progress_slider.sliderPressed.connect(self.on_slider_pressed)
         self.progress_slider.sliderReleased.connect(self.on_slider_released)
+        self.progress_slider.hovered.connect(self.show_sprite)
+        self.progress_slider.left.connect(self.sprite_label.hide)
         self.volume_slider.valueChanged.connect(self.set_volume)
         self.audio_output.setVolume(0.5)  
 
@@ -374,34 +416,49 @@ class Ui_Form(object):
         self.eklebutonu.clicked.connect(self.dosya_sec)
         self.temizlebutonu.clicked.connect(self.temizle)
         self.baslatbutonu.clicked.connect(self.donusumu_baslat)
+        self.iptalbutonu.clicked.connect(self.secili_isi_iptal_et)
         self.ses_checkbox.clicked.connect(self.format_listesini_guncelle)
         self.video_checkbox.clicked.connect(self.format_listesini_guncelle)
         self.resim_checkbox.clicked.connect(self.format_listesini_guncelle)
     
     def dosya_sec(self):
         file_filter = "Tüm Dosyalar (*.*)"
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             None, "Dosya Seç", "", file_filter
         )
-        if file_path:
+        if file_paths:
+            file_path = file_paths[0]
+            self.selected_files = file_paths
             self.current_file = file_path
-            self.dosya_adi_label.setText(os.path.basename(file_path))
+            if len(file_paths) > 1:
+                self.dosya_adi_label.setText(f"{os.path.basename(file_path)} (+{len(file_paths) - 1})")
+            else:
+                self.dosya_adi_label.setText(os.path.basename(file_path))
             self.format_adi_labeli.setText(os.path.splitext(file_path)[1])
             self.ses_checkbox.setEnabled(True)
             self.video_checkbox.setEnabled(True)
             self.resim_checkbox.setEnabled(True)
             self.fomat_combobox.setEnabled(True)
-            uzanti = os.path.splitext(file_path)[1].lower()
-            if uzanti in self.SUPPORTED_FORMATS['ses']:
-                self.ses_checkbox.setChecked(True)
-                self.show_audio_preview(file_path)
-            elif uzanti in self.SUPPORTED_FORMATS['video']:
-                self.video_checkbox.setChecked(True)
-                self.show_video_preview(file_path)
-            elif uzanti in self.SUPPORTED_FORMATS['resim']:
-                self.resim_checkbox.setChecked(True)
-                self.show_image_preview(file_path)
-            self.format_listesini_guncelle()
+            # İçerik tespiti ffprobe çalıştırabildiği için arka planda yapılır
+            worker = DetectWorker(file_path)
+            worker.ready.connect(self.dosya_turu_belirlendi)
+            worker.finished.connect(lambda: self.detect_workers.remove(worker))
+            self.detect_workers.append(worker)
+            worker.start()
+
+    def dosya_turu_belirlendi(self, file_path, dosya_turu):
+        if getattr(self, 'current_file', None) != file_path:
+            return
+        if dosya_turu == 'ses':
+            self.ses_checkbox.setChecked(True)
+            self.show_audio_preview(file_path)
+        elif dosya_turu == 'video':
+            self.video_checkbox.setChecked(True)
+            self.show_video_preview(file_path)
+        elif dosya_turu == 'resim':
+            self.resim_checkbox.setChecked(True)
+            self.show_image_preview(file_path)
+        self.format_listesini_guncelle()
 
     def format_listesini_guncelle(self):
         self.fomat_combobox.clear()
@@ -414,24 +471,74 @@ class Ui_Form(object):
         self.baslatbutonu.setEnabled(True)
 
     def show_video_preview(self, file_path):
-        self.image_label.hide()
         self.audio_frame.hide()
+        self.sprite_pixmap = None
+        self.media_controls_frame.show()
+        # Önbellek kontrolü de dosya okuduğu için arayüz iş parçacığında değil ProxyWorker'da yapılır
+        self.media_player.stop()
+        self.video_widget.hide()
+        self.image_label.show()
+        self.image_label.clear()
+        self.image_label.setText("Önizleme hazırlanıyor...")
+        worker = ProxyWorker(file_path, self.proxy_cache)
+        worker.ready.connect(self.proxy_ready)
+        worker.finished.connect(lambda: self.proxy_workers.remove(worker))
+        self.proxy_workers.append(worker)
+        worker.start()
+
+    def proxy_ready(self, file_path, proxy_path, sprite):
+        if getattr(self, 'current_file', None) != file_path:
+            return
+        # Önizleme kopyası üretilemezse özgün dosya oynatılır
+        self.play_video(proxy_path or file_path, sprite)
+
+    def play_video(self, file_path, sprite):
+        self.image_label.hide()
         self.video_widget.show()
+        self.sprite_info = sprite
+        self.sprite_pixmap = QPixmap(sprite['path']) if sprite else None
         self.media_player.setSource(QUrl.fromLocalFile(file_path))
         self.media_player.play()
         self.play_button.setText("⏸")
-        self.media_controls_frame.show()
+
+    def show_sprite(self, value, x):
+        if not self.sprite_pixmap or self.sprite_pixmap.isNull():
+            return
+        info = self.sprite_info
+        index = min(info['count'] - 1, int(value / 1000 / info['interval']))
+        tile_width, tile_height = info['tile_width'], info['tile_height']
+        self.sprite_label.setPixmap(self.sprite_pixmap.copy(
+            (index % info['columns']) * tile_width, (index // info['columns']) * tile_height, tile_width, tile_height))
+        self.sprite_label.resize(tile_width, tile_height)
+        point = self.progress_slider.mapTo(self.sprite_label.parentWidget(), QtCore.QPoint(x, 0))
+        left = max(0, min(point.x() - tile_width // 2, self.sprite_label.parentWidget().width() - tile_width))
+        self.sprite_label.move(left, point.y() - tile_height - 5)
+        self.sprite_label.show()
+        self.sprite_label.raise_()
 
     def show_image_preview(self, file_path):
         self.video_widget.hide()
         self.audio_frame.hide()
         self.image_label.show()
-        pixmap = QPixmap(file_path)
-        scaled_pixmap = pixmap.scaled(401, 301, QtCore.Qt.AspectRatioMode.KeepAspectRatio, 
-                                    QtCore.Qt.TransformationMode.SmoothTransformation)
-        self.image_label.setPixmap(scaled_pixmap)
+        self.image_label.clear()
+        self.image_label.setText("Önizleme hazırlanıyor...")
+        worker = ThumbnailWorker(file_path, self.thumbnail_cache)
+        worker.ready.connect(self.thumbnail_ready)
+        worker.finished.connect(lambda: self.thumbnail_workers.remove(worker))
+        self.thumbnail_workers.append(worker)
+        worker.start()
+
+    def thumbnail_ready(self, file_path, data):
+        if getattr(self, 'current_file', None) != file_path:
+            return
+        pixmap = QPixmap()
+        if data and pixmap.loadFromData(data):
+            self.image_label.setPixmap(pixmap)
+        else:
+            self.image_label.setText("Önizleme gösterilemiyor")
 
     def show_audio_preview(self, file_path):
+        self.sprite_pixmap = None
         self.video_widget.hide()
         self.image_label.hide()
         self.audio_frame.show()
@@ -449,15 +556,18 @@ class Ui_Form(object):
     
     def temizle(self):
         self.media_player.stop()
+        self.sprite_pixmap = None
+        self.sprite_label.hide()
         self.video_widget.hide()
         self.image_label.hide()
         self.audio_frame.hide()
         self.audio_play_button.setText("▶")
         self.current_file = None
+        self.selected_files = []
         self.dosya_adi_label.setText("EKLENEN DOSYA ADI")
         self.format_adi_labeli.setText("format adı")
         self.fomat_combobox.clear()
-        self.progressBar.setValue(0)
+        self.update_progress()
         self.sonuc_mesaji_label.setText("")
         self.ses_checkbox.setChecked(False)
         self.video_checkbox.setChecked(False)
@@ -469,7 +579,7 @@ class Ui_Form(object):
         self.baslatbutonu.setEnabled(False)
 
     def donusumu_baslat(self):
-        if not hasattr(self, 'current_file'):
+        if not getattr(self, 'current_file', None):
             QMessageBox.warning(None, "Hata", "Lütfen bir dosya seçin!")
             return
         conversion_type = None
@@ -483,50 +593,42 @@ class Ui_Form(object):
             QMessageBox.warning(None, "Hata", "Lütfen bir dönüşüm tipi seçin!")
             return
         target_format = self.fomat_combobox.currentText()
-        self.disable_ui_elements()
-        self.conversion_worker = ConversionWorker(
-            self.current_file, 
-            target_format,
-            conversion_type
-        )
-        self.conversion_worker.progress.connect(self.update_progress)
-        self.conversion_worker.finished.connect(self.conversion_finished)
-        self.conversion_worker.start()
-        self.sonuc_mesaji_label.setText("Dönüşüm işlemi devam ediyor...")
-        
-    def disable_ui_elements(self):
-        self.eklebutonu.setEnabled(False)
-        self.temizlebutonu.setEnabled(False)
-        self.baslatbutonu.setEnabled(False)
-        self.fomat_combobox.setEnabled(False)
-        self.ses_checkbox.setEnabled(False)
-        self.video_checkbox.setEnabled(False)
-        self.resim_checkbox.setEnabled(False)
-    
-    def enable_ui_elements(self):
-        self.eklebutonu.setEnabled(True)
-        self.temizlebutonu.setEnabled(True)
-        self.baslatbutonu.setEnabled(True)
-        self.fomat_combobox.setEnabled(True)
-        self.ses_checkbox.setEnabled(True)
-        self.video_checkbox.setEnabled(True)
-        self.resim_checkbox.setEnabled(True)
-        
-    def update_progress(self, value):
-        self.progressBar.setValue(value)
-    
-    def conversion_finished(self, success, message):
-        self.enable_ui_elements()
-        if success:
-            QMessageBox.information(None, "Başarılı", 
-                                  f"Dönüşüm tamamlandı!\nDosya konumu: {message}")
-            self.sonuc_mesaji_label.setText("Dönüşüm başarıyla tamamlandı!")
-            self.progressBar.setValue(100)
-        else:
-            QMessageBox.critical(None, "Hata", 
-                               f"Dönüşüm sırasında bir hata oluştu:\n{message}")
-            self.sonuc_mesaji_label.setText("Dönüşüm başarısız!")
-            self.progressBar.setValue(0)    
+        priority = self.oncelik_spinbox.value()
+        for file_path in self.selected_files:
+            self.conversion_queue.add(file_path, target_format, conversion_type, priority)
+        self.sonuc_mesaji_label.setText(f"{len(self.selected_files)} dönüşüm kuyruğa eklendi.")
+
+    def update_job_row(self, job):
+        item = self.job_items.get(job.job_id)
+        if item is None:
+            item = QtWidgets.QTreeWidgetItem(self.kuyruk_listesi)
+            item.setData(0, Qt.ItemDataRole.UserRole, job.job_id)
+            self.job_items[job.job_id] = item
+            self.jobs[job.job_id] = job
+        item.setText(0, os.path.basename(job.source_file))
+        item.setText(1, job.target_format)
+        item.setText(2, str(job.priority))
+        item.setText(3, job.state)
+        item.setText(4, f"%{job.progress}")
+        item.setToolTip(3, job.message)
+        self.update_progress()
+        if job.state == 'Tamamlandı':
+            self.sonuc_mesaji_label.setText(f"Tamamlandı: {os.path.basename(job.message)}")
+        elif job.state == 'Hata':
+            self.sonuc_mesaji_label.setText(f"Dönüşüm başarısız: {os.path.basename(job.source_file)}")
+
+    def update_progress(self):
+        active = [job for job in self.jobs.values() if job.state != 'İptal edildi']
+        if not active:
+            self.progressBar.setValue(0)
+            return
+        self.progressBar.setValue(sum(job.progress for job in active) // len(active))
+
+    def secili_isi_iptal_et(self):
+        for item in self.kuyruk_listesi.selectedItems():
+            job = self.jobs.get(item.data(0, Qt.ItemDataRole.UserRole))
+            if job is not None:
+                self.conversion_queue.cancel(job)
 
 if __name__ == "__main__":
     import sys
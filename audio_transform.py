@@ -0,0 +1,111 @@
+import math
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+BLOCK_FRAMES = 65536
+OUTPUT_CHUNK = 16384
+MAX_PHASES = 4096
+NORMALIZE_LEVELS = {'peak': -1.0, 'rms': -20.0}
+
+
+def read_blocks(stream, channels, block_frames=BLOCK_FRAMES):
+    frame_size = channels * 4
+    while True:
+        data = stream.read(block_frames * frame_size)
+        if not data:
+            break
+        usable = len(data) - len(data) % frame_size
+        yield np.frombuffer(data[:usable], dtype='<f4').reshape(-1, channels)
+
+
+def remix(block, channels):
+    if block.shape[1] == channels:
+        return block
+    if channels == 1:
+        return block.mean(axis=1, keepdims=True)
+    return np.repeat(block[:, :1], channels, axis=1)
+
+
+def measure(blocks, channels, mode):
+    peak = 0.0
+    squares = 0.0
+    count = 0
+    for block in blocks:
+        block = remix(block, channels)
+        if len(block):
+            peak = max(peak, float(np.abs(block).max()))
+        squares += float(np.square(block, dtype=np.float64).sum())
+        count += block.size
+    if mode == 'peak':
+        return 20 * math.log10(peak) if peak > 0 else None
+    return 10 * math.log10(squares / count) if squares > 0 else None
+
+
+class Resampler:
+    def __init__(self, in_rate, out_rate, channels, zero_crossings=16):
+        self.in_rate = int(in_rate)
+        self.out_rate = int(out_rate)
+        self.cutoff = min(1.0, self.out_rate / self.in_rate)
+        # Örnekleme düşürülürken süzgeç kesim frekansı kadar genişletilir
+        self.half_width = math.ceil(zero_crossings / self.cutoff)
+        self.taps = np.arange(-self.half_width + 1, self.half_width + 1)
+        # Çıktı konumlarının kesirli kısmı out_rate / gcd örnekte bir tekrarlar; her faz için
+        # süzgeç ağırlıkları bir kez hesaplanır
+        self.phases = self.out_rate // math.gcd(self.in_rate, self.out_rate)
+        fractions = (np.arange(self.phases, dtype=np.int64) * self.in_rate % self.out_rate) / self.out_rate
+        self.table = self.weights(fractions) if self.phases <= MAX_PHASES else None
+        self.history = np.zeros((self.half_width, channels), dtype=np.float32)
+        self.start = -self.half_width
+        self.next_output = 0
+
+    def weights(self, fractions):
+        distance = self.taps[None, :] - fractions[:, None]
+        weights = np.sinc(self.cutoff * distance) * (0.5 + 0.5 * np.cos(np.pi * distance / self.half_width))
+        weights /= weights.sum(axis=1, keepdims=True)
+        return weights.astype(np.float32)
+
+    def process(self, block, final=False):
+        buffer = np.concatenate([self.history, block])
+        if final:
+            buffer = np.concatenate([buffer, np.zeros((self.half_width, buffer.shape[1]), dtype=np.float32)])
+        # n. çıktı örneği floor(n * in_rate / out_rate) + half_width konumuna kadar girdi ister
+        available = self.start + len(buffer) - self.half_width
+        end = -(-available * self.out_rate // self.in_rate)
+        outputs = []
+        # Her kanal için kayan pencere görünümü; satır i, buffer[i:i + len(taps)] örneklerini kopyalamadan gösterir
+        windows = [sliding_window_view(np.ascontiguousarray(buffer[:, c]), len(self.taps))
+                   for c in range(buffer.shape[1])] if end > self.next_output else []
+        for chunk_start in range(self.next_output, end, OUTPUT_CHUNK):
+            n = np.arange(chunk_start, min(end, chunk_start + OUTPUT_CHUNK), dtype=np.int64)
+            base = n * self.in_rate // self.out_rate
+            if self.table is not None:
+                weights = self.table[n % self.phases]
+            else:
+                weights = self.weights((n * self.in_rate % self.out_rate) / self.out_rate)
+            rows = base - self.start + self.taps[0]
+            outputs.append(np.stack([np.einsum('nk,nk->n', weights, channel[rows]) for channel in windows], axis=1))
+        self.next_output = max(end, self.next_output)
+        keep = max(0, self.next_output * self.in_rate // self.out_rate - self.half_width + 1 - self.start)
+        self.history = buffer[keep:]
+        self.start += keep
+        if not outputs:
+            return np.zeros((0, buffer.shape[1]), dtype=np.float32)
+        return np.concatenate(outputs)
+
+
+def transform(blocks, in_rate, out_rate, channels, gain_db=0.0):
+    resampler = Resampler(in_rate, out_rate, channels) if in_rate != out_rate else None
+    gain = np.float32(10 ** (gain_db / 20))
+    for block in blocks:
+        block = remix(block, channels)
+        if resampler is not None:
+            block = resampler.process(block)
+        if gain != 1:
+            block = np.clip(block * gain, -1.0, 1.0)
+        yield np.ascontiguousarray(block, dtype='<f4')
+    if resampler is not None:
+        block = resampler.process(np.zeros((0, channels), dtype=np.float32), final=True)
+        if gain != 1:
+            block = np.clip(block * gain, -1.0, 1.0)
+        yield np.ascontiguousarray(block, dtype='<f4')
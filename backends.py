@@ -0,0 +1,73 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+class Backend:
+    def __init__(self, media_type, name, single, many, modules=(), formats=None, available=None):
+        self.media_type = media_type
+        self.name = name
+        self.single = single
+        self.many = many
+        self.modules = list(modules)
+        self.formats = set(formats) if formats else None
+        self.available = available
+        self.loaded = False
+        self.lock = threading.Lock()
+
+    def supports(self, target_ext):
+        return self.formats is None or target_ext in self.formats
+
+    def is_available(self):
+        return self.available is None or self.available()
+
+    def load(self):
+        with self.lock:
+            if self.loaded:
+                return
+            for module_name in self.modules:
+                try:
+                    importlib.import_module(module_name)
+                except ImportError as e:
+                    raise Exception(f"'{self.name}' dönüştürücüsü için gerekli kütüphane yüklü değil: {e.name}")
+            self.loaded = True
+
+
+class BackendRegistry:
+    def __init__(self):
+        self.backends = {}
+
+    def register(self, media_type, name, single, many, modules=(), formats=None, available=None):
+        backend = Backend(media_type, name, single, many, modules, formats, available)
+        self.backends.setdefault(media_type, []).append(backend)
+        return backend
+
+    def names(self, media_type):
+        return [backend.name for backend in self.backends.get(media_type, [])]
+
+    def select(self, media_type, target_ext, preferred=None):
+        candidates = [backend for backend in self.backends.get(media_type, []) if backend.supports(target_ext)]
+        if not candidates:
+            raise Exception(f"{target_ext} formatı için dönüştürücü bulunamadı.")
+        if preferred:
+            for backend in candidates:
+                if backend.name == preferred and backend.is_available():
+                    return backend
+        for backend in candidates:
+            if backend.is_available():
+                return backend
+        return candidates[0]
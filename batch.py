@@ -0,0 +1,264 @@
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from cache import DEFAULT_MAX_SIZE, ConversionCache
+from converter import (SUPPORTED_FORMATS, VPX_CPU_USED, MediaConverter, backend_registry, build_target_path,
+                       detect_file_type, detect_media_type, normalize_format)
+from journal import BatchJournal, output_checksums
+from metrics import JsonLinesLog
+
+
+def collect_files(inputs, recursive=True):
+    files = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            pattern = '**/*' if recursive else '*'
+            for child in sorted(path.glob(pattern)):
+                # Gizli dosyalar (yarım kalmış .part çıktıları dahil) atlanır
+                if child.name.startswith('.'):
+                    continue
+                if child.is_file() and detect_file_type(child):
+                    files.append((child, path))
+        elif path.is_file():
+            files.append((path, path.parent))
+        else:
+            print(f"Dosya bulunamadı: {item}", file=sys.stderr)
+    return files
+
+
+def build_jobs(files, target_formats, output_dir=None):
+    jobs = []
+    for source_path, base_dir in files:
+        # Bilinen uzantılar için ffprobe çalıştırılmaz; diğerleri içeriğe göre tanınır
+        file_type = detect_file_type(source_path) or detect_media_type(source_path)
+        if not file_type:
+            continue
+        target_dir = None
+        if output_dir:
+            target_dir = Path(output_dir) / source_path.parent.relative_to(base_dir)
+        target_files = []
+        for target_format in target_formats:
+            if target_format not in SUPPORTED_FORMATS[file_type]:
+                continue
+            if target_format == source_path.suffix.lower():
+                continue
+            target_files.append(str(build_target_path(source_path, target_format, target_dir)))
+        if target_files:
+            jobs.append((str(source_path), target_files, file_type))
+    return jobs
+
+
+def run_job(job, options=None, cache_settings=None, metrics_log=None, checksums=False):
+    source_file, target_files, file_type = job
+    try:
+        for target_file in target_files:
+            Path(target_file).parent.mkdir(parents=True, exist_ok=True)
+        cache = ConversionCache(*cache_settings) if cache_settings else None
+        event_callback = JsonLinesLog(metrics_log) if metrics_log else None
+        converter = MediaConverter(options=options, cache=cache, event_callback=event_callback)
+        converter.convert_many(source_file, target_files, file_type)
+        # Özetler işçi süreçte hesaplanır; böylece büyük çıktılar ana süreçte sırayla okunmaz
+        outputs = output_checksums(target_files) if checksums else None
+        return source_file, target_files, None, outputs
+    except Exception as e:
+        return source_file, target_files, str(e), None
+
+
+def run_batch(jobs, workers=None, options=None, cache_settings=None, metrics_log=None, journal=None):
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for job in jobs:
+            if journal is not None:
+                journal.record(job, 'running')
+            futures[executor.submit(run_job, job, options, cache_settings, metrics_log, journal is not None)] = job
+        for future in as_completed(futures):
+            source_file, target_files, error, outputs = future.result()
+            if error:
+                print(f"HATA  {source_file}: {error}", file=sys.stderr)
+            else:
+                print(f"OK    {source_file} -> {', '.join(target_files)}")
+            if journal is not None:
+                journal.record(futures[future], 'failed' if error else 'done', error, outputs)
+            results.append((source_file, target_files, error))
+    return results
+
+
+def parse_backend_overrides(values):
+    overrides = {}
+    for value in values:
+        target_format, _, backend = value.partition('=')
+        if not backend:
+            raise SystemExit(f"Geçersiz --backend değeri: {value}")
+        target_format = normalize_format(target_format)
+        backend = backend.strip()
+        names = [name for file_type, extensions in SUPPORTED_FORMATS.items() if target_format in extensions
+                 for name in backend_registry.names(file_type)]
+        if backend not in names:
+            raise SystemExit(f"{target_format} için bilinmeyen dönüştürücü: {backend} "
+                             f"(seçenekler: {', '.join(names) or 'yok'})")
+        overrides[target_format] = backend
+    return overrides
+
+
+def add_conversion_arguments(parser):
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                        help="Aynı anda çalışacak işlem sayısı")
+    add_option_arguments(parser)
+    add_cache_arguments(parser)
+
+
+def add_option_arguments(parser):
+    parser.add_argument('--audio-backend', choices=['ffmpeg', 'pydub'], default='ffmpeg',
+                        help="Ses dönüşüm motoru (ffmpeg: tek geçişte akış, pydub: tüm dosyayı belleğe alır)")
+    parser.add_argument('--backend', action='append', default=[], metavar='FORMAT=MOTOR',
+                        help="Belirli bir hedef format için dönüştürücü seç (örn. .m4a=pydub)")
+    parser.add_argument('--sample-rate', type=int, help="Ses çıktılarının örnekleme hızı (Hz)")
+    parser.add_argument('--channels', type=int, choices=[1, 2], help="Ses çıktılarının kanal sayısı")
+    parser.add_argument('--gain', type=float, help="Ses çıktılarına uygulanacak kazanç (dB)")
+    parser.add_argument('--normalize', choices=['peak', 'rms'],
+                        help="Sesi tepe veya ortalama (RMS) seviyesine göre normalleştir")
+    parser.add_argument('--normalize-level', type=float,
+                        help="Normalleştirme hedef seviyesi (dBFS, varsayılan: tepe -1, RMS -20)")
+    parser.add_argument('--no-remux', action='store_true',
+                        help="Uyumlu video akışlarını kopyalamak yerine her zaman yeniden kodla")
+    parser.add_argument('--video-backend', choices=['ffmpeg', 'moviepy'], default='ffmpeg',
+                        help="Video kodlama motoru")
+    parser.add_argument('--webm-codec', choices=['libvpx', 'libvpx-vp9'], default='libvpx',
+                        help="WebM çıktıları için video kodlayıcı")
+    parser.add_argument('--preset', choices=sorted(VPX_CPU_USED, key=VPX_CPU_USED.get, reverse=True),
+                        help="Kodlayıcı hız ön ayarı")
+    parser.add_argument('--crf', type=int, help="Sabit kalite değeri (CRF)")
+    parser.add_argument('--video-bitrate', help="Hedef video bit hızı (örn. 2M)")
+    parser.add_argument('--threads', type=int, help="Kodlayıcı başına iş parçacığı sayısı")
+    parser.add_argument('--pix-fmt', default='yuv420p',
+                        help="H.264 / VP8 / VP9 çıktıları için piksel formatı "
+                             "(varsayılan: yuv420p, boş bırakılırsa kaynağınki korunur)")
+    parser.add_argument('--segments', type=int, default=0,
+                        help="Uzun videoları anahtar karelerden bu kadar parçaya bölüp paralel kodla")
+    parser.add_argument('--segment-min-duration', type=float, default=300,
+                        help="Parçalı kodlama için gereken en kısa video süresi (saniye)")
+    parser.add_argument('--svg-width', type=int, help="SVG kaynaklar için hedef genişlik (piksel)")
+    parser.add_argument('--svg-height', type=int, help="SVG kaynaklar için hedef yükseklik (piksel)")
+    parser.add_argument('--svg-dpi', type=float, help="SVG kaynaklar için çözünürlük (DPI)")
+    parser.add_argument('--tile-min-megapixels', type=float, default=100,
+                        help="Bu boyuttan büyük resimleri sınırlı bellekle şerit şerit dönüştür (0: kapalı)")
+    parser.add_argument('--tile-memory', type=int, default=64,
+                        help="Şerit dönüşümünde kullanılacak en fazla bellek (MB)")
+    quality_target = parser.add_mutually_exclusive_group()
+    quality_target.add_argument('--target-size', type=int,
+                                help="JPEG/WebP/AVIF çıktıları için hedef dosya boyutu (KB); kalite buna göre aranır")
+    quality_target.add_argument('--target-psnr', type=float,
+                                help="JPEG/WebP/AVIF çıktıları için en düşük kalite (PSNR, dB)")
+    parser.add_argument('--avif-speed', type=int, choices=range(11), metavar='0-10',
+                        help="AVIF kodlayıcı hızı (yüksek değer daha hızlı, dosya daha büyük)")
+    parser.add_argument('--webp-method', type=int, choices=range(7), metavar='0-6',
+                        help="WebP sıkıştırma yöntemi (yüksek değer daha yavaş, dosya daha küçük)")
+
+
+def add_cache_arguments(parser):
+    parser.add_argument('--cache-dir', help="Dönüşüm önbelleği klasörü")
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_MAX_SIZE // 1024 ** 2,
+                        help="Önbelleğin en büyük boyutu (MB)")
+    parser.add_argument('--no-cache', action='store_true', help="Dönüşüm önbelleğini kullanma")
+    parser.add_argument('--cache-copy', action='store_true',
+                        help="Önbellek başka bir diskteyse çıktıları önbelleğe kopyala "
+                             "(varsayılan: yalnızca sabit bağlantı)")
+    parser.add_argument('--metrics-log', help="Aşama ölçümlerinin JSON satırları olarak yazılacağı dosya")
+
+
+def build_options(args):
+    return {
+        'audio_backend': args.audio_backend,
+        'video_backend': args.video_backend,
+        'remux': not args.no_remux,
+        'webm_codec': args.webm_codec,
+        'preset': args.preset,
+        'crf': args.crf,
+        'video_bitrate': args.video_bitrate,
+        'threads': args.threads,
+        'pix_fmt': args.pix_fmt or None,
+        'segments': args.segments,
+        'segment_min_duration': args.segment_min_duration,
+        'svg_width': args.svg_width,
+        'svg_height': args.svg_height,
+        'svg_dpi': args.svg_dpi,
+        'tile_min_pixels': int(args.tile_min_megapixels * 1000000) if args.tile_min_megapixels else None,
+        'tile_memory': args.tile_memory * 1024 ** 2,
+        'target_size': args.target_size * 1024 if args.target_size else None,
+        'target_psnr': args.target_psnr,
+        'avif_speed': args.avif_speed,
+        'webp_method': args.webp_method,
+        'audio_sample_rate': args.sample_rate,
+        'audio_channels': args.channels,
+        'audio_gain': args.gain,
+        'audio_normalize': args.normalize,
+        'audio_normalize_level': args.normalize_level,
+        'format_backends': parse_backend_overrides(args.backend)
+    }
+
+
+def build_cache(args):
+    if args.no_cache:
+        return None, None
+    cache = ConversionCache(args.cache_dir, args.cache_size * 1024 ** 2, args.cache_copy)
+    return cache, (str(cache.cache_dir), cache.max_size, cache.allow_copy)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="le1denfrost Format Dönüştürücü - toplu dönüşüm")
+    parser.add_argument('inputs', nargs='+', help="Dönüştürülecek dosyalar veya klasörler")
+    parser.add_argument('-f', '--formats', nargs='+', required=True,
+                        help="Hedef formatlar (örn. .mp3 .ogg .webp)")
+    parser.add_argument('-o', '--output-dir', help="Çıktı klasörü (varsayılan: kaynak dosyanın klasörü)")
+    parser.add_argument('--no-recursive', action='store_true', help="Alt klasörleri tarama")
+    parser.add_argument('--journal',
+                        help="Toplu iş günlüğü; aynı günlükle yeniden çalıştırıldığında tamamlanan dosyalar atlanır")
+    parser.add_argument('--verify', action='store_true',
+                        help="Tamamlanmış sayılan çıktıları günlükteki SHA-256 özetleriyle doğrula")
+    add_conversion_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    target_formats = [normalize_format(f) for f in args.formats]
+    files = collect_files(args.inputs, recursive=not args.no_recursive)
+    jobs = build_jobs(files, target_formats, args.output_dir)
+    if not jobs:
+        print("Dönüştürülecek dosya bulunamadı.", file=sys.stderr)
+        return 1
+    journal = BatchJournal(args.journal) if args.journal else None
+    if journal is not None:
+        previous = journal.summary()
+        if previous:
+            # Önceki çalıştırmadan 'running' kalan işler yarıda kesilmiştir ve yeniden dönüştürülür
+            print(f"Günlük: {previous.get('done', 0)} tamamlanmış, {previous.get('failed', 0)} başarısız, "
+                  f"{previous.get('running', 0)} yarıda kalmış iş.")
+        remaining = [job for job in jobs if not journal.is_complete(job, verify=args.verify)]
+        if len(remaining) < len(jobs):
+            print(f"{len(jobs) - len(remaining)} dosya günlükte tamamlanmış görünüyor, atlandı.")
+        jobs = remaining
+        if not jobs:
+            return 0
+    options = build_options(args)
+    cache, cache_settings = build_cache(args)
+    if cache:
+        stats_before = cache.stats()
+    results = run_batch(jobs, workers=args.jobs, options=options, cache_settings=cache_settings,
+                        metrics_log=args.metrics_log, journal=journal)
+    failed = sum(1 for _, _, error in results if error)
+    print(f"{len(results) - failed}/{len(results)} dönüşüm tamamlandı.")
+    if cache_settings:
+        stats = cache.stats()
+        print(f"Önbellek: {stats['hits'] - stats_before['hits']} isabet, "
+              f"{stats['misses'] - stats_before['misses']} ıskalama, "
+              f"{stats['entries']} kayıt, {stats['size'] / 1024 ** 2:.1f} MB")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+import argparse
+import array
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from converter import SUPPORTED_FORMATS, MediaConverter, build_target_path
+from ffmpeg_utils import ffmpeg_available
+from metrics import process_peak_rss_kb
+
+
+SAMPLE_RATE = 44100
+VIDEO_SIZE = '1280x720'
+
+
+def generate_images(work_dir, megapixel_sizes):
+    from PIL import Image
+    inputs = []
+    for megapixels in megapixel_sizes:
+        width = int(math.sqrt(megapixels * 1000000 * 4 / 3))
+        height = int(width * 3 / 4)
+        gradient = Image.linear_gradient('L').resize((width, height))
+        noise = Image.effect_noise((width, height), 48)
+        img = Image.merge('RGB', (gradient, noise, gradient.transpose(Image.FLIP_LEFT_RIGHT)))
+        for source_format in SUPPORTED_FORMATS['resim']:
+            if source_format in ['.svg', '.jpeg']:
+                continue
+            path = work_dir / f"image_{megapixels}mp{source_format}"
+            try:
+                img.save(path)
+            except Exception as e:
+                print(f"Atlandı {path.name}: {e}", file=sys.stderr)
+                continue
+            inputs.append({'path': path, 'file_type': 'resim', 'size': f"{megapixels}MP",
+                           'megapixels': width * height / 1000000})
+        path = work_dir / f"image_{megapixels}mp.svg"
+        path.write_text(synthetic_svg(width, height), encoding='utf-8')
+        inputs.append({'path': path, 'file_type': 'resim', 'size': f"{megapixels}MP",
+                       'megapixels': width * height / 1000000})
+    return inputs
+
+
+def synthetic_svg(width, height, shapes=500):
+    rng = random.Random(0)
+    elements = []
+    for _ in range(shapes):
+        x, y = rng.uniform(0, width), rng.uniform(0, height)
+        radius = rng.uniform(5, width / 20)
+        color = f"#{rng.randrange(0x1000000):06x}"
+        elements.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{radius:.1f}" fill="{color}" opacity="0.6"/>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}">'
+            + ''.join(elements) + '</svg>')
+
+
+def write_wav(path, seconds):
+    rng = random.Random(0)
+    frames = array.array('h')
+    for i in range(int(seconds * SAMPLE_RATE)):
+        t = i / SAMPLE_RATE
+        value = 0.4 * math.sin(2 * math.pi * 440 * t) + 0.1 * (rng.random() * 2 - 1)
+        sample = int(value * 32767)
+        frames.append(sample)
+        frames.append(sample)
+    with wave.open(str(path), 'wb') as wav_file:
+        wav_file.setnchannels(2)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes(frames.tobytes())
+
+
+def generate_audio(work_dir, lengths):
+    inputs = []
+    for seconds in lengths:
+        wav_path = work_dir / f"audio_{seconds}s.wav"
+        write_wav(wav_path, seconds)
+        for source_format in SUPPORTED_FORMATS['ses']:
+            path = work_dir / f"audio_{seconds}s{source_format}"
+            if source_format != '.wav':
+                subprocess.run(['ffmpeg', '-v', 'error', '-y', '-i', str(wav_path), str(path)], check=True)
+            inputs.append({'path': path, 'file_type': 'ses', 'size': f"{seconds}s", 'duration': seconds})
+    return inputs
+
+
+def generate_videos(work_dir, lengths):
+    inputs = []
+    for seconds in lengths:
+        for source_format in SUPPORTED_FORMATS['video']:
+            path = work_dir / f"video_{seconds}s{source_format}"
+            subprocess.run([
+                'ffmpeg', '-v', 'error', '-y',
+                '-f', 'lavfi', '-i', f"testsrc2=size={VIDEO_SIZE}:rate=30",
+                '-f', 'lavfi', '-i', 'sine=frequency=440',
+                '-t', str(seconds), str(path)
+            ], check=True)
+            inputs.append({'path': path, 'file_type': 'video', 'size': f"{seconds}s", 'duration': seconds})
+    return inputs
+
+
+def run_conversion(source_file, target_file, file_type, options):
+    converter = MediaConverter(options=options)
+    start = time.perf_counter()
+    converter.convert(source_file, target_file, file_type)
+    wall_time = time.perf_counter() - start
+    # Her ölçüm yeni bir süreçte çalıştığından süreç ömrü boyunca görülen tepe değerler bu dönüşüme aittir
+    peak_rss, peak_child_rss = process_peak_rss_kb()
+    return {
+        'wall_time': wall_time,
+        'backend': converter.metrics.backend,
+        'stages': converter.metrics.stages,
+        'peak_rss_kb': peak_rss,
+        'peak_child_rss_kb': peak_child_rss,
+        'output_bytes': os.path.getsize(target_file)
+    }
+
+
+def run_isolated(source_file, target_file, file_type, options):
+    # Her dönüşüm yeni bir süreçte çalışır; böylece tepe bellek ölçümleri birbirini etkilemez.
+    # max_tasks_per_child Python 3.11 gerektirdiğinden her çalıştırma için ayrı bir havuz açılır
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+        return executor.submit(run_conversion, source_file, target_file, file_type, options).result()
+
+
+def benchmark(inputs, work_dir, repeat=1, options=None):
+    results = []
+    for item in inputs:
+        source_path = item['path']
+        for target_format in SUPPORTED_FORMATS[item['file_type']]:
+            if target_format in [source_path.suffix, '.svg', '.jpeg']:
+                continue
+            target_path = build_target_path(source_path, target_format, work_dir / 'out')
+            runs = []
+            error = None
+            for _ in range(repeat):
+                try:
+                    runs.append(run_isolated(str(source_path), str(target_path), item['file_type'], options))
+                except Exception as e:
+                    error = str(e)
+                    break
+            result = {
+                'file_type': item['file_type'],
+                'source': source_path.suffix,
+                'target': target_format,
+                'size': item['size'],
+                'input_bytes': source_path.stat().st_size
+            }
+            if error:
+                result['error'] = error
+            else:
+                wall_time = statistics.median(run['wall_time'] for run in runs)
+                result.update({
+                    'wall_time': wall_time,
+                    'peak_rss_kb': max(run['peak_rss_kb'] for run in runs),
+                    'peak_child_rss_kb': max(run['peak_child_rss_kb'] for run in runs),
+                    'output_bytes': runs[-1]['output_bytes'],
+                    'backend': runs[-1]['backend'],
+                    'stages': runs[-1]['stages'],
+                    'input_mb_per_s': result['input_bytes'] / 1024 ** 2 / wall_time
+                })
+                if 'megapixels' in item:
+                    result['megapixels_per_s'] = item['megapixels'] / wall_time
+                if 'duration' in item:
+                    result['realtime_factor'] = item['duration'] / wall_time
+            results.append(result)
+            status = result.get('error') or f"{result['wall_time']:.3f}s"
+            print(f"{item['size']:>6} {source_path.suffix:>6} -> {target_format:<6} {status}", file=sys.stderr)
+    return results
+
+
+def environment_info():
+    info = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')
+    }
+    try:
+        info['commit'] = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=Path(__file__).parent,
+                                                 stderr=subprocess.DEVNULL).decode().strip()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        pass
+    if ffmpeg_available():
+        info['ffmpeg'] = subprocess.check_output(['ffmpeg', '-version']).decode().splitlines()[0]
+    return info
+
+
+def result_key(result):
+    return result['file_type'], result['source'], result['target'], result['size']
+
+
+def compare(baseline_path, results, threshold):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {result_key(r): r for r in json.load(f)['results'] if 'wall_time' in r}
+    regressions = 0
+    for result in results:
+        old = baseline.get(result_key(result))
+        if not old or 'wall_time' not in result:
+            continue
+        ratio = result['wall_time'] / old['wall_time']
+        if ratio > 1 + threshold:
+            regressions += 1
+            print(f"YAVAŞLAMA {' '.join(result_key(result))}: "
+                  f"{old['wall_time']:.3f}s -> {result['wall_time']:.3f}s (x{ratio:.2f})")
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="le1denfrost Format Dönüştürücü - performans ölçümü")
+    parser.add_argument('--types', nargs='+', choices=list(SUPPORTED_FORMATS), default=list(SUPPORTED_FORMATS),
+                        help="Ölçülecek dosya türleri")
+    parser.add_argument('--image-sizes', nargs='+', type=float, default=[1, 12],
+                        help="Üretilecek resim boyutları (megapiksel)")
+    parser.add_argument('--audio-lengths', nargs='+', type=int, default=[10, 120],
+                        help="Üretilecek ses süreleri (saniye)")
+    parser.add_argument('--video-lengths', nargs='+', type=int, default=[5],
+                        help="Üretilecek video süreleri (saniye)")
+    parser.add_argument('--repeat', type=int, default=1, help="Her dönüşümün tekrar sayısı (medyan alınır)")
+    parser.add_argument('--work-dir', help="Girdi ve çıktıların yazılacağı klasör")
+    parser.add_argument('-o', '--output', help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument('--compare', help="Karşılaştırılacak önceki JSON sonuç dosyası")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="Yavaşlama sayılacak oran (varsayılan: %%15)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if sys.platform == 'win32':
+        print("Bellek ölçümü için resource modülü gerekli; Windows desteklenmiyor.", file=sys.stderr)
+        return 1
+    if not ffmpeg_available():
+        print("Ölçüm için ffmpeg gerekli.", file=sys.stderr)
+        return 1
+    work_dir = Path(args.work_dir or tempfile.mkdtemp(prefix='converter_bench_'))
+    (work_dir / 'out').mkdir(parents=True, exist_ok=True)
+    inputs = []
+    if 'resim' in args.types:
+        inputs += generate_images(work_dir, args.image_sizes)
+    if 'ses' in args.types:
+        inputs += generate_audio(work_dir, args.audio_lengths)
+    if 'video' in args.types:
+        inputs += generate_videos(work_dir, args.video_lengths)
+    results = benchmark(inputs, work_dir, repeat=args.repeat)
+    report = {'environment': environment_info(), 'results': results}
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    if args.compare:
+        return 1 if compare(args.compare, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
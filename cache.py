@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from file_utils import atomic_path, replace_file, sqlite_connect, temp_path
+
+
+DEFAULT_MAX_SIZE = 2 * 1024 ** 3
+CHUNK_SIZE = 1024 * 1024
+
+_digest_lock = threading.Lock()
+_source_digests = {}
+
+
+def default_cache_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.environ.get('XDG_CACHE_HOME') \
+        or os.path.join(os.path.expanduser('~'), '.cache')
+    return Path(base) / 'format-converter'
+
+
+def file_digest(file_path):
+    file_path = Path(file_path)
+    stat = file_path.stat()
+    memo_key = (str(file_path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _digest_lock:
+        if memo_key in _source_digests:
+            return _source_digests[memo_key]
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(chunk)
+    with _digest_lock:
+        _source_digests[memo_key] = digest.hexdigest()
+    return _source_digests[memo_key]
+
+
+def link_or_copy(source, destination, allow_copy=True):
+    source = Path(source)
+    destination = Path(destination)
+    if destination.exists() and destination.samefile(source):
+        return True
+    temp = temp_path(destination)
+    try:
+        os.link(source, temp)
+    except OSError:
+        if not allow_copy:
+            return False
+        with atomic_path(destination) as temp:
+            shutil.copy2(source, temp)
+        return True
+    replace_file(temp, destination)
+    return True
+
+
+class ConversionCache:
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE, allow_copy=False):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / 'conversions'
+        self.objects_dir = self.cache_dir / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / 'index.db'
+        self.max_size = max_size
+        self.allow_copy = allow_copy
+        with self.connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS entries '
+                       '(key TEXT PRIMARY KEY, file_name TEXT, size INTEGER, last_access REAL)')
+            db.execute('CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER)')
+            db.execute("INSERT OR IGNORE INTO stats VALUES ('hits', 0), ('misses', 0), ('evictions', 0)")
+
+    def connect(self):
+        return sqlite_connect(self.index_path)
+
+    def make_key(self, source_path, target_ext, options=None):
+        params = json.dumps(options or {}, sort_keys=True, default=str)
+        key_source = f"{file_digest(source_path)}|{target_ext}|{params}"
+        return hashlib.sha256(key_source.encode()).hexdigest()
+
+    def fetch(self, key, target_path):
+        with self.connect() as db:
+            row = db.execute('SELECT file_name FROM entries WHERE key = ?', (key,)).fetchone()
+            cached_path = self.objects_dir / row[0] if row else None
+            if cached_path is None or not cached_path.exists():
+                if row:
+                    db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                db.execute("UPDATE stats SET value = value + 1 WHERE name = 'misses'")
+                return False
+            db.execute('UPDATE entries SET last_access = ? WHERE key = ?', (time.time(), key))
+            db.execute("UPDATE stats SET value = value + 1 WHERE name = 'hits'")
+        link_or_copy(cached_path, target_path)
+        return True
+
+    def store(self, key, output_path):
+        output_path = Path(output_path)
+        size = output_path.stat().st_size
+        # Sınırdan büyük çıktılar hemen silineceği için saklanmaz
+        if size > self.max_size:
+            return
+        file_name = key + output_path.suffix.lower()
+        # Önbellek başka bir diskteyse çıktılar varsayılan olarak kopyalanmaz; kopya yazma yükünü iki katına çıkarır
+        if not link_or_copy(output_path, self.objects_dir / file_name, self.allow_copy):
+            return
+        with self.connect() as db:
+            db.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)',
+                       (key, file_name, size, time.time()))
+        self.evict()
+
+    def evict(self):
+        with self.connect() as db:
+            total = db.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total <= self.max_size:
+                return
+            rows = db.execute('SELECT key, file_name, size FROM entries ORDER BY last_access').fetchall()
+            for key, file_name, size in rows:
+                if total <= self.max_size:
+                    break
+                try:
+                    os.remove(self.objects_dir / file_name)
+                except FileNotFoundError:
+                    pass
+                db.execute('DELETE FROM entries WHERE key = ?', (key,))
+                db.execute("UPDATE stats SET value = value + 1 WHERE name = 'evictions'")
+                total -= size
+
+    def stats(self):
+        with self.connect() as db:
+            stats = dict(db.execute('SELECT name, value FROM stats').fetchall())
+            entries, size = db.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries').fetchone()
+        stats['entries'] = entries
+        stats['size'] = size
+        return stats
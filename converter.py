@@ -0,0 +1,785 @@
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from backends import BackendRegistry, lazy_import
+from file_utils import replace_file, temp_path
+from metrics import JobMetrics, ProgressThrottle
+from ffmpeg_utils import (ffmpeg_available, ffmpeg_pipe, has_encoder, media_duration, probe_duration,
+                          probe_media, require_ffmpeg, run_ffmpeg)
+
+Image = lazy_import('PIL.Image')
+pydub = lazy_import('pydub')
+mp = lazy_import('moviepy.editor')
+svg_raster = lazy_import('svg_raster')
+image_tiles = lazy_import('image_tiles')
+quality_search = lazy_import('quality_search')
+audio_transform = lazy_import('audio_transform')
+
+
+SUPPORTED_FORMATS = {
+    'ses': ['.mp3', '.wav', '.ogg', '.aac', '.wma', '.m4a', '.flac'],
+    'video': ['.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm'],
+    'resim': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.svg', '.avif']
+}
+
+AUDIO_CODECS = {
+    '.mp3': 'libmp3lame',
+    '.wav': 'pcm_s16le',
+    '.ogg': 'libvorbis',
+    '.aac': 'aac',
+    '.wma': 'wmav2',
+    '.m4a': 'aac',
+    '.flac': 'flac'
+}
+
+PYDUB_FORMATS = {
+    '.aac': 'adts',
+    '.wma': 'asf',
+    '.m4a': 'ipod'
+}
+
+# Kapsayıcıya yeniden kodlamadan kopyalanabilen codec'ler (None: her codec kabul edilir)
+CONTAINER_CODECS = {
+    '.mp4': {
+        'video': {'h264', 'hevc', 'mpeg4', 'av1', 'vp9'},
+        'audio': {'aac', 'mp3', 'alac', 'opus', 'ac3', 'eac3', 'flac'}
+    },
+    '.mov': {
+        'video': {'h264', 'hevc', 'mpeg4', 'prores', 'mjpeg'},
+        'audio': {'aac', 'mp3', 'alac', 'ac3', 'pcm_s16le', 'pcm_s24le'}
+    },
+    '.mkv': {
+        'video': None,
+        'audio': None
+    },
+    '.webm': {
+        'video': {'vp8', 'vp9', 'av1'},
+        'audio': {'vorbis', 'opus'}
+    },
+    '.avi': {
+        'video': {'mpeg4', 'h264', 'mjpeg', 'msmpeg4v3', 'mpeg2video'},
+        'audio': {'mp3', 'ac3', 'pcm_s16le'}
+    },
+    '.flv': {
+        'video': {'h264', 'flv1'},
+        'audio': {'aac', 'mp3'}
+    },
+    '.wmv': {
+        'video': {'wmv1', 'wmv2', 'wmv3', 'vc1', 'msmpeg4v3'},
+        'audio': {'wmav1', 'wmav2', 'wmapro'}
+    }
+}
+
+# AVI, H.264/HEVC akışlarını Annex B biçiminde bekler; MP4/MKV'den kopyalanan akışlar dönüştürülür
+COPY_BITSTREAM_FILTERS = {
+    ('.avi', 'h264'): 'h264_mp4toannexb',
+    ('.avi', 'hevc'): 'hevc_mp4toannexb'
+}
+
+VIDEO_CODECS = {
+    '.webm': ('libvpx', 'libvorbis')
+}
+DEFAULT_VIDEO_CODECS = ('libx264', 'aac')
+ENCODER_CODEC_NAMES = {'libx264': 'h264', 'libvpx': 'vp8', 'libvpx-vp9': 'vp9'}
+
+# x264 hız ön ayarlarının libvpx -cpu-used karşılıkları
+VPX_CPU_USED = {
+    'ultrafast': 8,
+    'superfast': 7,
+    'veryfast': 6,
+    'faster': 5,
+    'fast': 4,
+    'medium': 3,
+    'slow': 2,
+    'slower': 1,
+    'veryslow': 0
+}
+
+DEFAULT_OPTIONS = {
+    'audio_backend': 'ffmpeg',
+    'video_backend': 'ffmpeg',
+    'remux': True,
+    'webm_codec': 'libvpx',
+    'preset': None,
+    'crf': None,
+    'video_bitrate': None,
+    'threads': None,
+    'pix_fmt': 'yuv420p',
+    'segments': 0,
+    'segment_min_duration': 300,
+    'svg_width': None,
+    'svg_height': None,
+    'svg_dpi': None,
+    'tile_min_pixels': 100000000,
+    'tile_memory': 64 * 1024 ** 2,
+    'target_size': None,
+    'target_psnr': None,
+    'avif_speed': None,
+    'webp_method': None,
+    'audio_sample_rate': None,
+    'audio_channels': None,
+    'audio_gain': None,
+    'audio_normalize': None,
+    'audio_normalize_level': None,
+    'format_backends': {}
+}
+
+QUALITY_SEARCH_FORMATS = {'.jpg', '.jpeg', '.webp', '.avif'}
+
+MULTI_FRAME_FORMATS = {'.gif', '.webp', '.tiff', '.png', '.avif'}
+
+ERROR_MESSAGES = {
+    'resim': "Resim dönüştürme hatası",
+    'ses': "Ses dönüşümü hatası",
+    'video': "Video dönüştürme hatası"
+}
+
+
+IMAGE_DEMUXERS = {'image2', 'gif', 'apng'}
+
+
+def detect_file_type(file_path):
+    uzanti = Path(file_path).suffix.lower()
+    for file_type, extensions in SUPPORTED_FORMATS.items():
+        if uzanti in extensions:
+            return file_type
+    return None
+
+
+def animation_params(img):
+    durations = []
+    for frame in range(img.n_frames):
+        img.seek(frame)
+        durations.append(img.info.get('duration') or 0)
+    img.seek(0)
+    params = {'save_all': True}
+    if any(durations):
+        params['duration'] = durations
+        params['loop'] = img.info.get('loop', 0)
+    return params
+
+
+def detect_media_type(file_path):
+    # GIF, APNG ve AVIF ffprobe'da video akışı olarak göründüğünden resim uzantılarına güvenilir
+    if detect_file_type(file_path) == 'resim':
+        return 'resim'
+    media_info = probe_media(file_path) if ffmpeg_available() else None
+    streams = media_info.get('streams', []) if media_info else []
+    format_name = media_info.get('format', {}).get('format_name', '') if media_info else ''
+    # ffprobe tek kareli resimleri image2 / *_pipe, hareketli olanları gif / apng demuxer'ları ile açar
+    is_image = format_name in IMAGE_DEMUXERS or format_name.endswith('_pipe')
+    if any(s.get('codec_type') == 'video' and not s.get('disposition', {}).get('attached_pic')
+           for s in streams):
+        return 'resim' if is_image else 'video'
+    if any(s.get('codec_type') == 'audio' for s in streams):
+        return 'ses'
+    file_type = detect_file_type(file_path)
+    if file_type is None:
+        # ffprobe yoksa resim dosyaları başlıklarından tanınır
+        try:
+            with Image.open(file_path):
+                return 'resim'
+        except Exception:
+            pass
+    return file_type
+
+
+def normalize_format(target_format):
+    target_format = target_format.strip().lower()
+    if not target_format.startswith('.'):
+        target_format = '.' + target_format
+    return target_format
+
+
+def video_encoder_args(target_ext, options):
+    codec, _ = VIDEO_CODECS.get(target_ext, DEFAULT_VIDEO_CODECS)
+    if target_ext == '.webm':
+        codec = options['webm_codec']
+        if codec == 'libvpx-vp9' and ffmpeg_available() and not has_encoder(codec):
+            codec = 'libvpx'
+
+    preset = options['preset']
+    crf = options['crf']
+    bitrate = options['video_bitrate']
+    args = ['-c:v', codec]
+    if codec == 'libx264':
+        if preset:
+            args += ['-preset', preset]
+        if crf is not None:
+            args += ['-crf', str(crf)]
+    elif codec.startswith('libvpx'):
+        args += ['-deadline', 'good']
+        if preset:
+            args += ['-cpu-used', str(VPX_CPU_USED[preset])]
+        if crf is not None:
+            args += ['-crf', str(crf)]
+            if not bitrate and codec == 'libvpx-vp9':
+                args += ['-b:v', '0']
+        if codec == 'libvpx-vp9':
+            args += ['-row-mt', '1']
+    # 4:2:2 / 4:4:4 / 10 bit / RGB kaynaklar tarayıcıların oynatamadığı profillere kodlanmasın diye
+    if options['pix_fmt'] and (codec == 'libx264' or codec.startswith('libvpx')):
+        args += ['-pix_fmt', options['pix_fmt']]
+    if bitrate:
+        args += ['-b:v', str(bitrate)]
+    return args
+
+
+def select_streams(media_info):
+    streams = media_info.get('streams', []) if media_info else []
+    video_streams = [s for s in streams
+                     if s.get('codec_type') == 'video'
+                     and not s.get('disposition', {}).get('attached_pic')]
+    audio_streams = [s for s in streams if s.get('codec_type') == 'audio']
+    return (video_streams[0] if video_streams else None), audio_streams
+
+
+def audio_stream_args(audio_streams, target_ext, options, input_index=0):
+    allowed = CONTAINER_CODECS.get(target_ext, {'video': set(), 'audio': set()})
+    _, audio_encoder = VIDEO_CODECS.get(target_ext, DEFAULT_VIDEO_CODECS)
+    args = []
+    for position, stream in enumerate(audio_streams):
+        args += ['-map', f"{input_index}:{stream['index']}"]
+        if options['remux'] and (allowed['audio'] is None or stream.get('codec_name') in allowed['audio']):
+            args += [f'-c:a:{position}', 'copy']
+        else:
+            args += [f'-c:a:{position}', audio_encoder]
+    return args
+
+
+def copy_bitstream_args(target_ext, codec_name):
+    bitstream_filter = COPY_BITSTREAM_FILTERS.get((target_ext, codec_name))
+    return ['-bsf:v', bitstream_filter] if bitstream_filter else []
+
+
+def plan_streams(media_info, target_ext, options):
+    video, audio_streams = select_streams(media_info)
+    if video is None:
+        return None
+    allowed = CONTAINER_CODECS.get(target_ext, {'video': set(), 'audio': set()})
+    args = ['-map', f"0:{video['index']}"]
+    video_copied = options['remux'] and (
+        allowed['video'] is None or video.get('codec_name') in allowed['video'])
+    if video_copied:
+        args += ['-c:v', 'copy']
+        args += copy_bitstream_args(target_ext, video.get('codec_name'))
+    else:
+        args += video_encoder_args(target_ext, options)
+    args += audio_stream_args(audio_streams, target_ext, options)
+    if options['threads']:
+        args += ['-threads', str(options['threads'])]
+    return args, video_copied
+
+
+def build_target_path(source_path, target_format, output_dir=None):
+    source_path = Path(source_path)
+    directory = Path(output_dir) if output_dir else source_path.parent
+    return directory / f"{source_path.stem}_converted{target_format}"
+
+
+class ConversionCancelled(Exception):
+    pass
+
+
+@lru_cache(maxsize=None)
+def moviepy_logger_class():
+    from proglog import ProgressBarLogger
+
+    class MoviepyProgressLogger(ProgressBarLogger):
+        def __init__(self, converter):
+            super().__init__()
+            self.converter = converter
+
+        def bars_callback(self, bar, attr, value, old_value=None):
+            self.converter.check_cancelled()
+            if bar == 't' and attr == 'index':
+                total = self.bars[bar].get('total')
+                if total:
+                    self.converter.emit_progress(min(int((value / total) * 100), 99))
+
+    return MoviepyProgressLogger
+
+
+class MediaConverter:
+    def __init__(self, progress_callback=None, options=None, cache=None, event_callback=None):
+        self.progress_callback = ProgressThrottle(progress_callback) if progress_callback else None
+        self.event_callback = event_callback
+        self.metrics = JobMetrics()
+        self.cache = cache
+        self.cancelled = False
+        self.processes = set()
+        self.final_paths = {}
+        self.options = dict(DEFAULT_OPTIONS)
+        if options:
+            self.options.update(options)
+
+    def emit_progress(self, value):
+        if self.progress_callback is not None:
+            self.progress_callback(value)
+
+    def cancel(self):
+        self.cancelled = True
+        for process in list(self.processes):
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise ConversionCancelled("Dönüşüm iptal edildi.")
+
+    def run_ffmpeg(self, args, duration=None, progress_callback=None):
+        self.check_cancelled()
+        run_ffmpeg(args, duration, progress_callback, processes=self.processes,
+                   rusage_callback=self.metrics.child_finished)
+        self.check_cancelled()
+
+    def convert(self, source_path, target_path, file_type):
+        return self.convert_many(source_path, [target_path], file_type)[0]
+
+    def convert_many(self, source_path, target_paths, file_type):
+        source_path = Path(source_path)
+        target_paths = [Path(target_path) for target_path in target_paths]
+        self.metrics = JobMetrics(source_path, file_type, self.event_callback)
+        pending = target_paths
+        if self.cache is not None:
+            with self.metrics.stage('cache'):
+                keys = {target_path: self.cache.make_key(source_path, target_path.suffix.lower(), self.options)
+                        for target_path in target_paths}
+                pending = [target_path for target_path in target_paths
+                           if not self.cache.fetch(keys[target_path], target_path)]
+            if not pending:
+                self.metrics.set_backend('cache')
+        if pending:
+            # Çıktılar önce geçici dosyalara yazılır ve ancak tamamlanınca yerine taşınır;
+            # yarıda kalan bir dönüşüm hedef yolda eksik bir dosya bırakmaz
+            partials = [temp_path(target_path) for target_path in pending]
+            # Olaylarda geçici dosya yerine kalıcı hedef yolu bildirilir
+            self.final_paths = dict(zip(partials, pending))
+            try:
+                self.run_conversion(source_path, partials, file_type)
+                with self.metrics.stage('commit'):
+                    for partial, target_path in zip(partials, pending):
+                        replace_file(partial, target_path, durable=True)
+            except Exception as e:
+                for partial in partials:
+                    partial.unlink(missing_ok=True)
+                self.metrics.finish(target_paths, error=str(e))
+                self.check_cancelled()
+                raise
+            if self.cache is not None:
+                with self.metrics.stage('cache'):
+                    for target_path in pending:
+                        self.cache.store(keys[target_path], target_path)
+        self.metrics.finish(target_paths)
+        self.emit_progress(100)
+        return target_paths
+
+    def preferred_backend(self, file_type, target_ext):
+        preferred = self.options['format_backends'].get(target_ext)
+        if file_type == 'ses' and self.audio_transform_requested():
+            # Örnekleme hızı, kanal, kazanç ve normalleştirme yalnızca numpy motorunda uygulanır
+            if preferred and preferred != 'numpy':
+                raise Exception(f"{target_ext} için seçilen '{preferred}' motoru ses dönüşüm seçeneklerini "
+                                "desteklemiyor; numpy motorunu kullanın.")
+            return 'numpy'
+        if preferred:
+            return preferred
+        if file_type == 'ses':
+            return self.options['audio_backend']
+        if file_type == 'video':
+            return self.options['video_backend']
+        return None
+
+    def run_conversion(self, source_path, target_paths, file_type):
+        if file_type not in ERROR_MESSAGES:
+            raise Exception(f"Desteklenmeyen dosya türü: {file_type}")
+        groups = {}
+        for target_path in target_paths:
+            target_ext = target_path.suffix.lower()
+            backend = backend_registry.select(file_type, target_ext,
+                                              self.preferred_backend(file_type, target_ext))
+            groups.setdefault(backend, []).append(target_path)
+        try:
+            for backend, paths in groups.items():
+                backend.load()
+                self.metrics.set_backend(backend.name)
+                if len(paths) == 1:
+                    getattr(self, backend.single)(source_path, paths[0])
+                else:
+                    getattr(self, backend.many)(source_path, paths)
+        except ConversionCancelled:
+            raise
+        except Exception as e:
+            raise Exception(f"{ERROR_MESSAGES[file_type]}: {str(e)}")
+
+    def convert_image(self, source_path, target_path):
+        self.convert_image_many(source_path, [target_path])
+
+    def convert_image_many(self, source_path, target_paths):
+        if self.convert_image_tiled(source_path, target_paths):
+            return
+        with self.metrics.stage('decode'):
+            img = self.load_image(source_path)
+            img.load()
+        self.check_cancelled()
+        self.emit_progress(50)
+        if getattr(img, 'n_frames', 1) > 1:
+            # Çok kareli kaynaklar kareleri kaydederken tek tek çözülür; bu yüzden kopyalanmaz
+            for target_path in target_paths:
+                img.seek(0)
+                self.save_image(img, target_path)
+        elif len(target_paths) == 1:
+            self.save_image(img, target_paths[0])
+        else:
+            # save() encoderinfo'yu görüntünün üzerine yazdığı için her hedef kendi kopyasını alır
+            copies = [img.copy() for _ in target_paths]
+            with ThreadPoolExecutor(max_workers=len(target_paths)) as executor:
+                list(executor.map(self.save_image, copies, target_paths))
+        self.emit_progress(100)
+
+    def convert_image_tiled(self, source_path, target_paths):
+        min_pixels = self.options['tile_min_pixels']
+        if min_pixels is None or Path(source_path).suffix.lower() == '.svg':
+            return False
+        if any(target_path.suffix.lower() not in image_tiles.STREAM_FORMATS for target_path in target_paths):
+            return False
+        with self.metrics.stage('probe'):
+            reader = image_tiles.open_band_reader(source_path, min_pixels)
+        if reader is None:
+            return False
+        self.metrics.set_backend('pillow-tiled')
+        total_rows = sum(page['size'][1] for page in reader.pages)
+        done_rows = 0
+        writers = []
+        try:
+            with self.metrics.stage('tiled'):
+                for target_path in target_paths:
+                    writers.append(image_tiles.open_writer(target_path, reader.raw_size()))
+                for index, page in enumerate(reader.pages):
+                    # Tek sayfalık formatlara yalnızca ilk sayfa yazılır
+                    page_writers = [writer for writer in writers if index == 0 or writer.multi_page]
+                    if not page_writers:
+                        break
+                    for writer, target_path in zip(writers, target_paths):
+                        if writer in page_writers:
+                            writer.start_page(page['size'], image_tiles.output_mode(page, target_path.suffix.lower()),
+                                              page['dpi'])
+                    for band in reader.bands(page, reader.band_rows(page, self.options['tile_memory'])):
+                        self.check_cancelled()
+                        for writer in page_writers:
+                            writer.write(band)
+                        done_rows += band.height
+                        self.emit_progress(int(done_rows / total_rows * 99))
+        finally:
+            for writer in writers:
+                writer.close()
+        self.emit_progress(100)
+        return True
+
+    def load_image(self, source_path):
+        if Path(source_path).suffix.lower() == '.svg':
+            return svg_raster.rasterize_svg(source_path, width=self.options['svg_width'],
+                                            height=self.options['svg_height'], dpi=self.options['svg_dpi'])
+        return Image.open(source_path)
+
+    def save_image(self, img, target_path):
+        target_ext = Path(target_path).suffix.lower()
+        if target_ext == '.svg':
+            raise Exception("SVG formatına dönüştürme desteklenmiyor. Lütfen başka bir format seçin.")
+        save_params = {}
+        if getattr(img, 'n_frames', 1) > 1 and target_ext in MULTI_FRAME_FORMATS:
+            save_params = animation_params(img)
+        # convert() yalnızca geçerli kareyi döndürür; çok kareli çıktılarda kareleri kodlayıcı dönüştürür
+        with self.metrics.stage('transform'):
+            if target_ext in ['.avif', '.jpg', '.jpeg'] and not save_params:
+                if img.mode in ['RGBA', 'P']:
+                    img = img.convert('RGB')
+        format_name = Image.registered_extensions()[target_ext]
+        params = dict(save_params, **self.encoder_params(target_ext))
+        target_size = self.options['target_size']
+        target_psnr = self.options['target_psnr']
+        if target_ext in QUALITY_SEARCH_FORMATS and not save_params and (target_size or target_psnr):
+            with self.metrics.stage('search'):
+                quality, data = quality_search.search_quality(img, format_name, params, target_size, target_psnr)
+            self.metrics.emit('quality', target=str(self.final_paths.get(target_path, target_path)),
+                              quality=quality, size=len(data))
+            with self.metrics.stage('write'):
+                with open(target_path, 'wb') as f:
+                    f.write(data)
+        else:
+            # Kodlayıcı doğrudan dosyaya yazar; ara bellek büyük çıktılarda tepe belleği ikiye katlar
+            with self.metrics.stage('encode'):
+                img.save(target_path, format=format_name, **params)
+
+    def encoder_params(self, target_ext):
+        params = {}
+        if target_ext == '.avif':
+            params['quality'] = 75
+            if self.options['avif_speed'] is not None:
+                params['speed'] = self.options['avif_speed']
+        elif target_ext == '.webp' and self.options['webp_method'] is not None:
+            params['method'] = self.options['webp_method']
+        return params
+
+    def audio_transform_requested(self):
+        return any(self.options[name] for name in ['audio_sample_rate', 'audio_channels', 'audio_gain',
+                                                    'audio_normalize'])
+
+    def decode_audio(self, source_path, stream_index, channels, progress_callback=None):
+        args = ['-i', source_path, '-map', f"0:{stream_index}", '-vn', '-f', 'f32le', '-ac', channels, 'pipe:1']
+        with ffmpeg_pipe(args, processes=self.processes, rusage_callback=self.metrics.child_finished) as decoder:
+            for block in audio_transform.read_blocks(decoder.stdout, channels):
+                self.check_cancelled()
+                if progress_callback is not None:
+                    progress_callback(len(block))
+                yield block
+
+    def convert_audio_numpy(self, source_path, target_path):
+        self.convert_audio_numpy_many(source_path, [target_path])
+
+    def convert_audio_numpy_many(self, source_path, target_paths):
+        require_ffmpeg()
+        with self.metrics.stage('probe'):
+            media_info = probe_media(source_path)
+        streams = media_info.get('streams', []) if media_info else []
+        stream = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+        if stream is None:
+            raise Exception("Kaynak dosyada ses akışı bulunamadı.")
+        in_rate = int(stream['sample_rate'])
+        in_channels = int(stream['channels'])
+        out_rate = self.options['audio_sample_rate'] or in_rate
+        out_channels = self.options['audio_channels'] or in_channels
+        # İkiden fazla kanal stereoya ffmpeg'in kanal matrisiyle indirilir; gerisi NumPy ile yapılır
+        decode_channels = 2 if in_channels > 2 and out_channels <= 2 else in_channels
+        gain_db = self.options['audio_gain'] or 0
+        normalize = self.options['audio_normalize']
+        duration = media_duration(media_info)
+        total_frames = duration * in_rate * (2 if normalize else 1) if duration else None
+        decoded = [0]
+
+        def track_progress(frames):
+            decoded[0] += frames
+            if total_frames:
+                self.emit_progress(min(int(decoded[0] / total_frames * 100), 99))
+
+        if normalize:
+            with self.metrics.stage('analyze'):
+                level = audio_transform.measure(
+                    self.decode_audio(source_path, stream['index'], decode_channels, track_progress),
+                    out_channels, normalize)
+            if level is not None:
+                target_level = self.options['audio_normalize_level']
+                if target_level is None:
+                    target_level = audio_transform.NORMALIZE_LEVELS[normalize]
+                gain_db += target_level - level
+        args = ['-f', 'f32le', '-ar', out_rate, '-ac', out_channels, '-i', 'pipe:0']
+        for target_path in target_paths:
+            args += ['-c:a', AUDIO_CODECS[target_path.suffix.lower()], target_path]
+        blocks = self.decode_audio(source_path, stream['index'], decode_channels, track_progress)
+        encoder_pipe = ffmpeg_pipe(args, write=True, processes=self.processes,
+                                   rusage_callback=self.metrics.child_finished)
+        with self.metrics.stage('transform'), encoder_pipe as encoder:
+            for block in audio_transform.transform(blocks, in_rate, out_rate, out_channels, gain_db):
+                encoder.stdin.write(block.tobytes())
+        self.emit_progress(100)
+
+    def transcode_audio(self, source_path, target_path):
+        self.transcode_audio_many(source_path, [target_path])
+
+    def transcode_audio_many(self, source_path, target_paths):
+        require_ffmpeg()
+        args = ['-i', source_path]
+        for target_path in target_paths:
+            codec = AUDIO_CODECS[target_path.suffix.lower()]
+            if not has_encoder(codec):
+                raise Exception(f"Kurulu ffmpeg '{codec}' kodlayıcısını desteklemiyor.")
+            args += ['-vn', '-c:a', codec, target_path]
+        with self.metrics.stage('probe'):
+            duration = probe_duration(source_path)
+        with self.metrics.stage('transcode'):
+            self.run_ffmpeg(args, duration, self.emit_progress)
+        self.emit_progress(100)
+
+    def export_audio(self, audio, target_path):
+        target_ext = Path(target_path).suffix.lower()
+        format_name = PYDUB_FORMATS.get(target_ext, target_ext.replace('.', ''))
+        audio.export(target_path, format=format_name, codec=AUDIO_CODECS[target_ext])
+
+    def convert_audio_pydub(self, source_path, target_path):
+        self.convert_audio_pydub_many(source_path, [target_path])
+
+    def convert_audio_pydub_many(self, source_path, target_paths):
+        with self.metrics.stage('decode'):
+            audio = pydub.AudioSegment.from_file(str(source_path))
+        self.check_cancelled()
+        self.emit_progress(50)
+        with self.metrics.stage('encode'), ThreadPoolExecutor(max_workers=len(target_paths)) as executor:
+            list(executor.map(lambda target_path: self.export_audio(audio, target_path), target_paths))
+        self.emit_progress(100)
+
+    def convert_video(self, source_path, target_path):
+        require_ffmpeg()
+        with self.metrics.stage('probe'):
+            media_info = probe_media(source_path)
+        plan = plan_streams(media_info, Path(target_path).suffix.lower(), self.options)
+        if plan is None:
+            raise Exception("Kaynak dosyada video akışı bulunamadı.")
+        args, video_copied = plan
+        if not video_copied and self.use_segments(media_info):
+            self.metrics.set_backend('ffmpeg-segmented')
+            self.encode_video_segmented(source_path, target_path, media_info)
+            return
+        if video_copied:
+            self.metrics.set_backend('ffmpeg-copy')
+        self.encode_video_ffmpeg(source_path, target_path, media_info, args)
+
+    def convert_video_many(self, source_path, target_paths):
+        require_ffmpeg()
+        with self.metrics.stage('probe'):
+            media_info = probe_media(source_path)
+        plans = [plan_streams(media_info, target_path.suffix.lower(), self.options)
+                 for target_path in target_paths]
+        if any(plan is None for plan in plans):
+            raise Exception("Kaynak dosyada video akışı bulunamadı.")
+        # Parçalı kodlama açıksa yeniden kodlanacak hedefler ayrı ayrı parçalı yoldan geçer;
+        # akışı kopyalanabilen hedefler yine tek ffmpeg komutunda yazılır
+        segmented = []
+        if self.use_segments(media_info):
+            segmented = [target_path for (_, video_copied), target_path in zip(plans, target_paths)
+                         if not video_copied]
+        single = [(stream_args, target_path) for (stream_args, _), target_path in zip(plans, target_paths)
+                  if target_path not in segmented]
+        if segmented:
+            self.metrics.set_backend('ffmpeg-segmented')
+        elif all(video_copied for _, video_copied in plans):
+            self.metrics.set_backend('ffmpeg-copy')
+        if single:
+            args = ['-i', source_path]
+            for stream_args, target_path in single:
+                args += stream_args + [target_path]
+            with self.metrics.stage('transcode'):
+                self.run_ffmpeg(args, media_duration(media_info), self.emit_progress)
+        for target_path in segmented:
+            self.check_cancelled()
+            self.encode_video_segmented(source_path, target_path, media_info)
+        self.emit_progress(100)
+
+    def convert_video_moviepy(self, source_path, target_path):
+        # Yeniden kodlama gerekmiyorsa akışları kopyalamak her zaman daha hızlıdır
+        if ffmpeg_available():
+            with self.metrics.stage('probe'):
+                media_info = probe_media(source_path)
+            plan = plan_streams(media_info, Path(target_path).suffix.lower(), self.options)
+            if plan is not None and plan[1]:
+                self.metrics.set_backend('ffmpeg-copy')
+                self.encode_video_ffmpeg(source_path, target_path, media_info, plan[0])
+                return
+        self.encode_video_moviepy(source_path, target_path)
+
+    def convert_video_moviepy_many(self, source_path, target_paths):
+        for target_path in target_paths:
+            self.convert_video_moviepy(source_path, target_path)
+
+    def encode_video_ffmpeg(self, source_path, target_path, media_info, stream_args):
+        duration = media_duration(media_info)
+        with self.metrics.stage('transcode'):
+            self.run_ffmpeg(['-i', source_path] + stream_args + [target_path], duration, self.emit_progress)
+        self.emit_progress(100)
+
+    def use_segments(self, media_info):
+        if self.options['video_backend'] != 'ffmpeg' or (self.options['segments'] or 0) < 2:
+            return False
+        duration = media_duration(media_info)
+        return duration is not None and duration >= self.options['segment_min_duration']
+
+    def encode_video_segmented(self, source_path, target_path, media_info):
+        target_ext = Path(target_path).suffix.lower()
+        video, audio_streams = select_streams(media_info)
+        segment_count = self.options['segments']
+        duration = media_duration(media_info)
+        work_dir = Path(tempfile.mkdtemp(prefix='segments_', dir=Path(target_path).parent))
+        try:
+            with self.metrics.stage('split'):
+                self.run_ffmpeg([
+                    '-i', source_path, '-map', f"0:{video['index']}", '-c', 'copy',
+                    '-f', 'segment', '-segment_time', f"{duration / segment_count:.3f}",
+                    '-reset_timestamps', '1', work_dir / 'part_%04d.mkv'
+                ])
+                parts = sorted(work_dir.glob('part_*.mkv'))
+                part_durations = [probe_duration(part) or duration / len(parts) for part in parts]
+            total_duration = sum(part_durations)
+            part_progress = [0] * len(parts)
+            lock = threading.Lock()
+
+            encoder_args = video_encoder_args(target_ext, self.options)
+
+            def encode_part(index):
+                def report(value):
+                    with lock:
+                        part_progress[index] = value
+                        done = sum(p * d for p, d in zip(part_progress, part_durations))
+                        self.emit_progress(min(int(done / total_duration), 99))
+                output = work_dir / f"encoded_{index:04d}.mkv"
+                threads = self.options['threads'] or max(1, (os.cpu_count() or 1) // len(parts))
+                args = ['-i', parts[index]] + encoder_args
+                self.run_ffmpeg(args + ['-an', '-threads', threads, output], part_durations[index], report)
+                return output
+
+            with self.metrics.stage('encode'), ThreadPoolExecutor(max_workers=len(parts)) as executor:
+                encoded = list(executor.map(encode_part, range(len(parts))))
+            concat_list = work_dir / 'concat.txt'
+            with open(concat_list, 'w', encoding='utf-8') as f:
+                for output in encoded:
+                    escaped = str(output.resolve()).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+            args = ['-f', 'concat', '-safe', '0', '-i', concat_list, '-i', source_path,
+                    '-map', '0:v', '-c:v', 'copy']
+            args += copy_bitstream_args(target_ext, ENCODER_CODEC_NAMES.get(encoder_args[1]))
+            args += audio_stream_args(audio_streams, target_ext, self.options, input_index=1)
+            with self.metrics.stage('write'):
+                self.run_ffmpeg(args + [target_path])
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        self.emit_progress(100)
+
+    def encode_video_moviepy(self, source_path, target_path):
+        with self.metrics.stage('decode'):
+            video = mp.VideoFileClip(str(source_path))
+        output_ext = os.path.splitext(target_path)[1].lower()
+        _, audio_codec = VIDEO_CODECS.get(output_ext, DEFAULT_VIDEO_CODECS)
+        encoder_args = video_encoder_args(output_ext, self.options)
+        try:
+            with self.metrics.stage('encode'):
+                video.write_videofile(
+                    str(target_path),
+                    codec=encoder_args[1],
+                    audio_codec=audio_codec,
+                    threads=self.options['threads'],
+                    ffmpeg_params=encoder_args[2:],
+                    verbose=False,
+                    logger=moviepy_logger_class()(self)
+                )
+        finally:
+            video.close()
+        self.emit_progress(100)
+
+
+backend_registry = BackendRegistry()
+backend_registry.register('resim', 'pillow', 'convert_image', 'convert_image_many',
+                          modules=['PIL.Image'])
+backend_registry.register('ses', 'ffmpeg', 'transcode_audio', 'transcode_audio_many',
+                          available=ffmpeg_available)
+backend_registry.register('ses', 'pydub', 'convert_audio_pydub', 'convert_audio_pydub_many',
+                          modules=['pydub'])
+backend_registry.register('ses', 'numpy', 'convert_audio_numpy', 'convert_audio_numpy_many',
+                          modules=['numpy'], available=ffmpeg_available)
+backend_registry.register('video', 'ffmpeg', 'convert_video', 'convert_video_many',
+                          available=ffmpeg_available)
+backend_registry.register('video', 'moviepy', 'convert_video_moviepy', 'convert_video_moviepy_many',
+                          modules=['moviepy.editor', 'proglog'])
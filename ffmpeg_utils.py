@@ -0,0 +1,164 @@
+import json
+import os
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
+
+
+PROBE_CACHE_SIZE = 4096
+
+_probe_lock = threading.Lock()
+_probe_cache = OrderedDict()
+
+
+@lru_cache(maxsize=None)
+def ffmpeg_available():
+    try:
+        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
+        return True
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return False
+
+
+def require_ffmpeg():
+    if not ffmpeg_available():
+        raise Exception("Bu dönüşüm için ffmpeg gerekli. Lütfen sisteminize ffmpeg yükleyin.")
+
+
+@lru_cache(maxsize=None)
+def ffmpeg_capabilities():
+    capabilities = {'encoders': set(), 'muxers': set()}
+    if not ffmpeg_available():
+        return capabilities
+    for kind, flag in [('encoders', '-encoders'), ('muxers', '-muxers')]:
+        output = subprocess.run(['ffmpeg', '-hide_banner', flag], capture_output=True,
+                                universal_newlines=True).stdout
+        in_list = False
+        for line in output.splitlines():
+            # Başlık satırları " ------" veya " --" ayracıyla biter
+            if line.strip().startswith('--'):
+                in_list = True
+                continue
+            parts = line.split()
+            if in_list and len(parts) >= 2:
+                capabilities[kind].update(parts[1].split(','))
+    return capabilities
+
+
+def has_encoder(name):
+    return name in ffmpeg_capabilities()['encoders']
+
+
+def probe_duration(file_path):
+    return media_duration(probe_media(file_path))
+
+
+def wait_process(process, rusage_callback=None):
+    # RUSAGE_CHILDREN tüm eski alt süreçlerin en büyüğünü verdiğinden her ffmpeg os.wait4 ile beklenir
+    if rusage_callback is None or not hasattr(os, 'wait4') or process.returncode is not None:
+        return process.wait()
+    try:
+        _, status, rusage = os.wait4(process.pid, 0)
+    except ChildProcessError:
+        # İptal sırasında kill() süreci önceden toplamış olabilir
+        return process.wait()
+    process.returncode = os.waitstatus_to_exitcode(status)
+    rusage_callback(rusage)
+    return process.returncode
+
+
+def run_ffmpeg(args, duration=None, progress_callback=None, processes=None, rusage_callback=None):
+    cmd = ['ffmpeg', '-hide_banner', '-nostdin', '-loglevel', 'error', '-y',
+           '-progress', 'pipe:1', '-nostats'] + [str(arg) for arg in args]
+    with tempfile.TemporaryFile() as error_log:
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=error_log,
+            universal_newlines=True
+        )
+        if processes is not None:
+            processes.add(process)
+        try:
+            for line in process.stdout:
+                key, _, value = line.strip().partition('=')
+                if key == 'out_time_us' and duration and progress_callback is not None:
+                    try:
+                        current_time = int(value) / 1000000
+                    except ValueError:
+                        continue
+                    progress_callback(min(int((current_time / duration) * 100), 99))
+            wait_process(process, rusage_callback)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            if processes is not None:
+                processes.discard(process)
+        if process.returncode != 0:
+            error_log.seek(0)
+            details = error_log.read().decode(errors='replace').strip()
+            raise Exception(f"FFmpeg dönüşüm hatası: {details}" if details else "FFmpeg dönüşüm hatası")
+
+
+@contextmanager
+def ffmpeg_pipe(args, write=False, processes=None, rusage_callback=None):
+    # write=True ise ffmpeg girdisini stdin'den okur, aksi halde çıktısını stdout'a yazar
+    cmd = ['ffmpeg', '-hide_banner', '-loglevel', 'error', '-y'] + [str(arg) for arg in args]
+    with tempfile.TemporaryFile() as error_log:
+        process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE if write else subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL if write else subprocess.PIPE,
+            stderr=error_log
+        )
+        if processes is not None:
+            processes.add(process)
+        try:
+            yield process
+            if write:
+                process.stdin.close()
+            wait_process(process, rusage_callback)
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            if processes is not None:
+                processes.discard(process)
+        if process.returncode != 0:
+            error_log.seek(0)
+            details = error_log.read().decode(errors='replace').strip()
+            raise Exception(f"FFmpeg dönüşüm hatası: {details}" if details else "FFmpeg dönüşüm hatası")
+
+
+def probe_media(file_path):
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+    with _probe_lock:
+        if key in _probe_cache:
+            _probe_cache.move_to_end(key)
+            return _probe_cache[key]
+    cmd = ['ffprobe', '-v', 'error', '-show_streams', '-show_format',
+           '-of', 'json', str(file_path)]
+    try:
+        media_info = json.loads(subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode())
+    except (subprocess.CalledProcessError, FileNotFoundError, ValueError):
+        media_info = None
+    with _probe_lock:
+        _probe_cache[key] = media_info
+        while len(_probe_cache) > PROBE_CACHE_SIZE:
+            _probe_cache.popitem(last=False)
+    return media_info
+
+
+def media_duration(media_info):
+    try:
+        return float(media_info['format']['duration'])
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,81 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+
+@contextmanager
+def sqlite_connect(db_path, row_factory=None):
+    db = sqlite3.connect(db_path, timeout=30)
+    if row_factory is not None:
+        db.row_factory = row_factory
+    try:
+        with db:
+            yield db
+    finally:
+        db.close()
+
+
+def temp_path(path):
+    # Gizli, süreç ve iş parçacığına özgü ad; hedef uzantısı korunur çünkü ffmpeg ve Pillow biçimi uzantıdan seçer
+    path = Path(path)
+    return path.with_name(f".{path.stem}.{os.getpid()}.{threading.get_ident()}.part{path.suffix}")
+
+
+def fsync_directory(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def replace_file(temp, destination, durable=False):
+    # durable=True ise veri ve dizin kaydı diske yazılmadan dönülmez; çökme sonrası ya eski ya yeni dosya kalır
+    if durable:
+        with open(temp, 'rb') as f:
+            os.fsync(f.fileno())
+    os.replace(temp, destination)
+    if durable:
+        fsync_directory(Path(destination).parent)
+
+
+@contextmanager
+def atomic_path(destination, durable=False):
+    temp = temp_path(destination)
+    try:
+        yield temp
+        replace_file(temp, destination, durable)
+    finally:
+        temp.unlink(missing_ok=True)
+
+
+def touch(path):
+    # Erişim zamanı değişiklik zamanına yazılır; prune_directory en uzun süredir kullanılmayanı önce siler
+    os.utime(path)
+    return Path(path)
+
+
+def prune_directory(directory, max_size):
+    files = []
+    for path in Path(directory).iterdir():
+        if path.name.startswith('.'):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        if path.is_file():
+            files.append((stat, path))
+    total = sum(stat.st_size for stat, _ in files)
+    for stat, path in sorted(files, key=lambda item: item[0].st_mtime):
+        if total <= max_size:
+            break
+        path.unlink(missing_ok=True)
+        total -= stat.st_size
@@ -0,0 +1,297 @@
+import struct
+import threading
+import zlib
+from PIL import Image
+
+
+STREAM_FORMATS = {'.png', '.bmp', '.tif', '.tiff'}
+MULTI_PAGE_FORMATS = {'.tif', '.tiff'}
+BAND_MODES = {'1', 'L', 'LA', 'P', 'RGB', 'RGBA', 'CMYK'}
+
+_open_lock = threading.Lock()
+
+
+def open_unchecked(source_path):
+    # Şerit okuma belleği sınırladığı için Pillow'un dekompresyon bombası sınırı açılış sırasında kaldırılır
+    with _open_lock:
+        max_pixels = Image.MAX_IMAGE_PIXELS
+        Image.MAX_IMAGE_PIXELS = None
+        try:
+            return Image.open(source_path)
+        finally:
+            Image.MAX_IMAGE_PIXELS = max_pixels
+
+
+def row_stride(mode, rawmode, width):
+    try:
+        return len(Image.new(mode, (width, 1)).tobytes('raw', rawmode))
+    except (ValueError, OSError):
+        return None
+
+
+def raw_tiles(img):
+    tiles = []
+    for tile in img.tile:
+        if tile.codec_name != 'raw':
+            return None
+        args = (tile.args,) if isinstance(tile.args, str) else tuple(tile.args)
+        rawmode = args[0]
+        stride = args[1] if len(args) > 1 else 0
+        ystep = args[2] if len(args) > 2 else 1
+        x0, y0, x1, y1 = tile.extents
+        if not stride:
+            stride = row_stride(img.mode, rawmode, x1 - x0)
+        if not stride or ystep not in (1, -1):
+            return None
+        tiles.append((tile.extents, tile.offset, rawmode, stride, ystep))
+    return tiles
+
+
+def open_band_reader(source_path, min_pixels):
+    img = open_unchecked(source_path)
+    pages = []
+    for frame in range(getattr(img, 'n_frames', 1)):
+        img.seek(frame)
+        tiles = raw_tiles(img)
+        if tiles is None or img.mode not in BAND_MODES:
+            img.close()
+            return None
+        pages.append({
+            'size': img.size,
+            'mode': img.mode,
+            'tiles': tiles,
+            'palette': img.palette if img.mode == 'P' else None,
+            'transparency': img.info.get('transparency'),
+            'dpi': img.info.get('dpi')
+        })
+    img.close()
+    width, height = pages[0]['size']
+    if width * height < min_pixels:
+        return None
+    return BandReader(source_path, pages)
+
+
+class BandReader:
+    def __init__(self, source_path, pages):
+        self.source_path = source_path
+        self.pages = pages
+
+    def band_rows(self, page, memory):
+        width, height = page['size']
+        bytes_per_pixel = max(1, len(Image.new(page['mode'], (1, 1)).tobytes()))
+        # Dönüştürülmüş kopya ve kodlayıcı tamponu için payı bırakılır
+        return max(1, min(height, memory // (width * bytes_per_pixel * 4)))
+
+    def raw_size(self):
+        return sum(page['size'][0] * page['size'][1] * 4 for page in self.pages)
+
+    def bands(self, page, rows):
+        width, height = page['size']
+        with open(self.source_path, 'rb') as f:
+            for top in range(0, height, rows):
+                bottom = min(height, top + rows)
+                band = Image.new(page['mode'], (width, bottom - top))
+                for (x0, y0, x1, y1), offset, rawmode, stride, ystep in page['tiles']:
+                    first, last = max(top, y0), min(bottom, y1)
+                    if first >= last:
+                        continue
+                    # Aşağıdan yukarı saklanan satırlarda (BMP) şerit dosyanın sonundan sayılır
+                    row = first - y0 if ystep == 1 else y1 - last
+                    f.seek(offset + row * stride)
+                    data = f.read((last - first) * stride)
+                    part = Image.frombytes(page['mode'], (x1 - x0, last - first), data, 'raw', rawmode, stride, ystep)
+                    band.paste(part, (x0, first - top))
+                if page['palette'] is not None:
+                    band.putpalette(page['palette'])
+                if page['transparency'] is not None:
+                    band.info['transparency'] = page['transparency']
+                yield band
+
+
+def output_mode(page, target_ext):
+    mode = page['mode']
+    if mode == '1' and target_ext != '.bmp':
+        return '1'
+    if mode in ('1', 'L'):
+        return 'L'
+    if mode in ('LA', 'RGBA') or (mode == 'P' and page['transparency'] is not None):
+        return 'RGBA'
+    return 'RGB'
+
+
+def prepare_band(band, mode):
+    if band.mode == 'P' and mode == 'RGBA':
+        return band.convert('RGBA')
+    return band if band.mode == mode else band.convert(mode)
+
+
+class PngWriter:
+    multi_page = False
+    COLOR_TYPES = {'1': (1, 0), 'L': (8, 0), 'RGB': (8, 2), 'RGBA': (8, 6)}
+
+    def __init__(self, target_path, raw_size=0):
+        self.f = open(target_path, 'wb')
+        self.mode = None
+        self.compressor = zlib.compressobj(6)
+
+    def chunk(self, chunk_type, data):
+        self.f.write(struct.pack('>I', len(data)) + chunk_type + data)
+        self.f.write(struct.pack('>I', zlib.crc32(chunk_type + data) & 0xffffffff))
+
+    def start_page(self, size, mode, dpi=None):
+        self.mode = mode
+        bit_depth, color_type = self.COLOR_TYPES[mode]
+        self.f.write(b'\x89PNG\r\n\x1a\n')
+        self.chunk(b'IHDR', struct.pack('>IIBBBBB', size[0], size[1], bit_depth, color_type, 0, 0, 0))
+        if dpi:
+            self.chunk(b'pHYs', struct.pack('>IIB', round(dpi[0] / 0.0254), round(dpi[1] / 0.0254), 1))
+
+    def write(self, band):
+        data = prepare_band(band, self.mode).tobytes()
+        stride = len(data) // band.height
+        # Her satır filtresiz (tip 0) yazılır; satır filtreleri tüm görüntüyü gerektirmez ama yavaştır
+        rows = b''.join(b'\x00' + data[i:i + stride] for i in range(0, len(data), stride))
+        compressed = self.compressor.compress(rows)
+        if compressed:
+            self.chunk(b'IDAT', compressed)
+
+    def close(self):
+        try:
+            if self.mode is not None:
+                self.chunk(b'IDAT', self.compressor.flush())
+                self.chunk(b'IEND', b'')
+        finally:
+            self.f.close()
+
+
+class BmpWriter:
+    multi_page = False
+    RAW_MODES = {'L': ('L', 8), 'RGB': ('BGR', 24), 'RGBA': ('BGRA', 32)}
+
+    def __init__(self, target_path, raw_size=0):
+        self.f = open(target_path, 'wb')
+        self.mode = None
+
+    def start_page(self, size, mode, dpi=None):
+        self.mode = mode
+        self.width, self.height = size
+        self.rawmode, bits = self.RAW_MODES[mode]
+        self.stride = ((self.width * bits + 31) >> 3) & ~3
+        palette = b''.join(bytes((i, i, i, 0)) for i in range(256)) if mode == 'L' else b''
+        self.data_offset = 14 + 40 + len(palette)
+        file_size = self.data_offset + self.stride * self.height
+        if file_size >= 2 ** 32:
+            raise Exception("BMP dosyası 4 GB sınırını aşıyor.")
+        ppm = [round(d / 0.0254) for d in dpi] if dpi else [0, 0]
+        self.f.write(b'BM' + struct.pack('<IHHI', file_size, 0, 0, self.data_offset))
+        self.f.write(struct.pack('<IiiHHIIiiII', 40, self.width, self.height, 1, bits, 0,
+                                 self.stride * self.height, ppm[0], ppm[1], len(palette) // 4, 0))
+        self.f.write(palette)
+        self.f.truncate(file_size)
+        self.top = 0
+
+    def write(self, band):
+        data = prepare_band(band, self.mode).tobytes('raw', (self.rawmode, self.stride, -1))
+        # BMP satırları aşağıdan yukarı saklar; şerit kendi yerine yazılır
+        self.f.seek(self.data_offset + (self.height - self.top - band.height) * self.stride)
+        self.f.write(data)
+        self.top += band.height
+
+    def close(self):
+        self.f.close()
+
+
+class TiffWriter:
+    multi_page = True
+    SHORT, LONG, RATIONAL, LONG8 = 3, 4, 5, 16
+    FORMATS = {SHORT: 'H', LONG: 'I', RATIONAL: 'II', LONG8: 'Q'}
+    SAMPLES = {'1': (1, 1, 1), 'L': (1, 8, 1), 'RGB': (3, 8, 2), 'RGBA': (4, 8, 2)}
+
+    def __init__(self, target_path, raw_size=0):
+        self.f = open(target_path, 'wb')
+        # 4 GB'ı aşabilecek çıktılar BigTIFF olarak yazılır
+        self.big = raw_size > 2 ** 32 - 2 ** 24
+        if self.big:
+            self.f.write(b'II+\x00' + struct.pack('<HHQ', 8, 0, 0))
+            self.next_ifd_pointer = 8
+        else:
+            self.f.write(b'II*\x00' + struct.pack('<I', 0))
+            self.next_ifd_pointer = 4
+        self.page = None
+
+    def start_page(self, size, mode, dpi=None):
+        self.finish_page()
+        self.page = {'size': size, 'mode': mode, 'dpi': dpi, 'offsets': [], 'counts': [], 'rows_per_strip': 0}
+
+    def write(self, band):
+        data = prepare_band(band, self.page['mode']).tobytes()
+        if self.f.tell() % 2:
+            self.f.write(b'\x00')
+        self.page['offsets'].append(self.f.tell())
+        self.page['counts'].append(len(data))
+        self.page['rows_per_strip'] = max(self.page['rows_per_strip'], band.height)
+        self.f.write(data)
+
+    def finish_page(self):
+        page = self.page
+        if page is None:
+            return
+        self.page = None
+        samples, bits, photometric = self.SAMPLES[page['mode']]
+        offset_type = self.LONG8 if self.big else self.LONG
+        entries = [
+            (256, self.LONG, [page['size'][0]]),
+            (257, self.LONG, [page['size'][1]]),
+            (258, self.SHORT, [bits] * samples),
+            (259, self.SHORT, [1]),
+            (262, self.SHORT, [photometric]),
+            (273, offset_type, page['offsets']),
+            (277, self.SHORT, [samples]),
+            (278, self.LONG, [page['rows_per_strip']]),
+            (279, offset_type, page['counts']),
+            (284, self.SHORT, [1])
+        ]
+        if page['dpi']:
+            entries += [(282, self.RATIONAL, [round(page['dpi'][0] * 1000), 1000]),
+                        (283, self.RATIONAL, [round(page['dpi'][1] * 1000), 1000]),
+                        (296, self.SHORT, [2])]
+        if page['mode'] == 'RGBA':
+            entries.append((338, self.SHORT, [2]))
+        entries.sort()
+        inline_size = 8 if self.big else 4
+        packed_entries = []
+        for tag, field_type, values in entries:
+            data = struct.pack('<' + self.FORMATS[field_type][0] * len(values), *values)
+            count = len(values) // 2 if field_type == self.RATIONAL else len(values)
+            if len(data) > inline_size:
+                if self.f.tell() % 2:
+                    self.f.write(b'\x00')
+                value_offset = self.f.tell()
+                self.f.write(data)
+                data = struct.pack('<Q' if self.big else '<I', value_offset)
+            packed_entries.append(struct.pack('<HHQ' if self.big else '<HHI', tag, field_type, count)
+                                  + data.ljust(inline_size, b'\x00'))
+        if self.f.tell() % 2:
+            self.f.write(b'\x00')
+        ifd_offset = self.f.tell()
+        count_format, pointer_format = ('<Q', '<Q') if self.big else ('<H', '<I')
+        self.f.write(struct.pack(count_format, len(packed_entries)) + b''.join(packed_entries))
+        next_pointer = self.f.tell()
+        self.f.write(struct.pack(pointer_format, 0))
+        self.f.seek(self.next_ifd_pointer)
+        self.f.write(struct.pack(pointer_format, ifd_offset))
+        self.f.seek(0, 2)
+        self.next_ifd_pointer = next_pointer
+
+    def close(self):
+        try:
+            self.finish_page()
+        finally:
+            self.f.close()
+
+
+WRITERS = {'.png': PngWriter, '.bmp': BmpWriter, '.tif': TiffWriter, '.tiff': TiffWriter}
+
+
+def open_writer(target_path, raw_size=0):
+    return WRITERS[target_path.suffix.lower()](target_path, raw_size)
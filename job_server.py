@@ -0,0 +1,345 @@
+import argparse
+import hmac
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Process
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+from batch import add_option_arguments, build_jobs, build_options, collect_files
+from cache import default_cache_dir
+from converter import DEFAULT_OPTIONS, normalize_format
+from file_utils import sqlite_connect
+from job_worker import auth_headers, path_allowed, run_worker
+
+
+JOB_STATES = ['queued', 'leased', 'done', 'failed', 'cancelled']
+
+
+class LeaseLost(Exception):
+    pass
+
+
+class JobQueue:
+    def __init__(self, db_path=None, visibility_timeout=60, max_attempts=3, retry_delay=5):
+        self.db_path = Path(db_path) if db_path else default_cache_dir() / 'jobs.db'
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lock = threading.Lock()
+        with self.connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT, '
+                       'targets TEXT, file_type TEXT, options TEXT, priority INTEGER, state TEXT, '
+                       'attempts INTEGER, max_attempts INTEGER, worker TEXT, lease_token TEXT, lease_expires REAL, '
+                       'available_at REAL, progress INTEGER, error TEXT, created REAL, updated REAL)')
+            db.execute('CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (state, priority, id)')
+
+    def connect(self):
+        return sqlite_connect(self.db_path, sqlite3.Row)
+
+    def to_dict(self, row):
+        job = dict(row)
+        job['targets'] = json.loads(job['targets'])
+        job['options'] = json.loads(job['options'])
+        return job
+
+    def submit(self, source, targets, file_type, options=None, priority=0, max_attempts=None):
+        now = time.time()
+        with self.connect() as db:
+            cursor = db.execute(
+                'INSERT INTO jobs (source, targets, file_type, options, priority, state, attempts, max_attempts, '
+                'available_at, progress, created, updated) VALUES (?, ?, ?, ?, ?, ?, 0, ?, ?, 0, ?, ?)',
+                (source, json.dumps(targets), file_type, json.dumps(options or {}), priority, 'queued',
+                 max_attempts or self.max_attempts, now, now, now))
+            return cursor.lastrowid
+
+    def get(self, job_id):
+        with self.connect() as db:
+            row = db.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self.to_dict(row) if row else None
+
+    def list(self, state=None):
+        with self.connect() as db:
+            if state:
+                rows = db.execute('SELECT * FROM jobs WHERE state = ? ORDER BY id', (state,)).fetchall()
+            else:
+                rows = db.execute('SELECT * FROM jobs ORDER BY id').fetchall()
+        return [self.to_dict(row) for row in rows]
+
+    def stats(self):
+        with self.connect() as db:
+            counts = dict(db.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+        return {state: counts.get(state, 0) for state in JOB_STATES}
+
+    def retry_or_fail(self, db, job, error, now):
+        if job['attempts'] >= job['max_attempts']:
+            db.execute("UPDATE jobs SET state = 'failed', error = ?, lease_token = NULL, updated = ? WHERE id = ?",
+                       (error, now, job['id']))
+        else:
+            # Her yeni denemede bekleme süresi ikiye katlanır
+            available_at = now + self.retry_delay * 2 ** (job['attempts'] - 1)
+            db.execute("UPDATE jobs SET state = 'queued', error = ?, lease_token = NULL, available_at = ?, "
+                       "progress = 0, updated = ? WHERE id = ?", (error, available_at, now, job['id']))
+
+    def lease(self, worker):
+        now = time.time()
+        with self.lock, self.connect() as db:
+            # Süresi dolan kiralamalar (çöken veya kopan işçiler) yeniden denenir
+            for job in db.execute("SELECT * FROM jobs WHERE state = 'leased' AND lease_expires < ?", (now,)).fetchall():
+                self.retry_or_fail(db, job, f"Kiralama süresi doldu ({job['worker']})", now)
+            row = db.execute("SELECT * FROM jobs WHERE state = 'queued' AND available_at <= ? "
+                             "ORDER BY priority DESC, id LIMIT 1", (now,)).fetchone()
+            if row is None:
+                return None
+            token = uuid.uuid4().hex
+            db.execute("UPDATE jobs SET state = 'leased', worker = ?, lease_token = ?, lease_expires = ?, "
+                       "attempts = attempts + 1, updated = ? WHERE id = ?",
+                       (worker, token, now + self.visibility_timeout, now, row['id']))
+            job = self.to_dict(db.execute('SELECT * FROM jobs WHERE id = ?', (row['id'],)).fetchone())
+        job['visibility_timeout'] = self.visibility_timeout
+        return job
+
+    def heartbeat(self, job_id, token, progress=None):
+        now = time.time()
+        with self.lock, self.connect() as db:
+            cursor = db.execute("UPDATE jobs SET lease_expires = ?, progress = COALESCE(?, progress), updated = ? "
+                                "WHERE id = ? AND state = 'leased' AND lease_token = ?",
+                                (now + self.visibility_timeout, progress, now, job_id, token))
+            if cursor.rowcount == 0:
+                raise LeaseLost("İş kiralaması geçersiz veya iş iptal edildi.")
+
+    def complete(self, job_id, token, error=None):
+        now = time.time()
+        with self.lock, self.connect() as db:
+            job = db.execute("SELECT * FROM jobs WHERE id = ? AND state = 'leased' AND lease_token = ?",
+                             (job_id, token)).fetchone()
+            if job is None:
+                raise LeaseLost("İş kiralaması geçersiz veya iş iptal edildi.")
+            if error:
+                self.retry_or_fail(db, job, error, now)
+            else:
+                db.execute("UPDATE jobs SET state = 'done', progress = 100, error = NULL, lease_token = NULL, "
+                           "updated = ? WHERE id = ?", (now, job_id))
+
+    def cancel(self, job_id):
+        with self.lock, self.connect() as db:
+            cursor = db.execute("UPDATE jobs SET state = 'cancelled', lease_token = NULL, updated = ? "
+                                "WHERE id = ? AND state IN ('queued', 'leased')", (time.time(), job_id))
+        return cursor.rowcount > 0
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def route(self):
+        parts = [part for part in urlsplit(self.path).path.split('/') if part]
+        if len(parts) >= 2 and parts[0] == 'jobs':
+            try:
+                return parts[0], int(parts[1]), parts[2] if len(parts) > 2 else None
+            except ValueError:
+                return None, None, None
+        return (parts[0] if parts else None), None, None
+
+    def authorized(self):
+        token = self.server.token
+        return not token or hmac.compare_digest(self.headers.get('X-Job-Token', ''), token)
+
+    def handle_request(self, handler):
+        if not self.authorized():
+            self.send_json(401, {'error': "Geçersiz veya eksik erişim anahtarı."})
+            return
+        try:
+            handler()
+        except PermissionError as e:
+            self.send_json(403, {'error': str(e)})
+        except LeaseLost as e:
+            self.send_json(409, {'error': str(e)})
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_json(400, {'error': f"Geçersiz istek: {e}"})
+
+    def do_GET(self):
+        self.handle_request(self.get)
+
+    def do_POST(self):
+        self.handle_request(self.post)
+
+    def do_DELETE(self):
+        self.handle_request(self.delete)
+
+    def get(self):
+        queue = self.server.queue
+        resource, job_id, _ = self.route()
+        if resource == 'stats':
+            self.send_json(200, queue.stats())
+        elif resource == 'jobs' and job_id is None:
+            state = parse_qs(urlsplit(self.path).query).get('state', [None])[0]
+            self.send_json(200, queue.list(state))
+        elif resource == 'jobs':
+            job = queue.get(job_id)
+            if job:
+                self.send_json(200, job)
+            else:
+                self.send_json(404, {'error': "İş bulunamadı."})
+        else:
+            self.send_json(404, {'error': "Bilinmeyen adres."})
+
+    def post(self):
+        queue = self.server.queue
+        resource, job_id, action = self.route()
+        body = self.read_json()
+        if resource == 'jobs' and job_id is None:
+            if not body['targets']:
+                raise ValueError("hedef dosya listesi boş")
+            for path in [body['source']] + body['targets']:
+                if not path_allowed(path, self.server.roots):
+                    raise PermissionError(f"İzin verilen klasörlerin dışında: {path}")
+            unknown = set(body.get('options') or {}) - set(DEFAULT_OPTIONS)
+            if unknown:
+                raise ValueError(f"bilinmeyen seçenekler: {', '.join(sorted(unknown))}")
+            job_id = queue.submit(str(body['source']), [str(target) for target in body['targets']],
+                                  body['file_type'], body.get('options'), int(body.get('priority', 0)),
+                                  body.get('max_attempts'))
+            self.send_json(201, {'id': job_id})
+        elif resource == 'lease':
+            job = queue.lease(str(body['worker']))
+            if job:
+                self.send_json(200, job)
+            else:
+                self.send_json(204)
+        elif resource == 'jobs' and action == 'heartbeat':
+            queue.heartbeat(job_id, body['lease_token'], body.get('progress'))
+            self.send_json(200, {'ok': True})
+        elif resource == 'jobs' and action == 'complete':
+            queue.complete(job_id, body['lease_token'], body.get('error'))
+            self.send_json(200, {'ok': True})
+        else:
+            self.send_json(404, {'error': "Bilinmeyen adres."})
+
+    def delete(self):
+        resource, job_id, _ = self.route()
+        if resource == 'jobs' and job_id is not None and self.server.queue.cancel(job_id):
+            self.send_json(200, {'ok': True})
+        else:
+            self.send_json(404, {'error': "İptal edilebilecek iş bulunamadı."})
+
+
+def make_server(queue, host='127.0.0.1', port=8765, token=None, roots=None):
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.queue = queue
+    server.token = token
+    server.roots = roots
+    return server
+
+
+def post_json(url, payload, token=None):
+    request = Request(url, data=json.dumps(payload).encode(), method='POST', headers=auth_headers(token))
+    with urlopen(request, timeout=30) as response:
+        return json.loads(response.read() or b'null')
+
+
+def serve(args):
+    # Kimlik doğrulaması olmayan API dışarıya açılırsa herkes işçilere istediği dosyayı okutup yazdırabilir
+    if not args.token and args.host not in ('127.0.0.1', 'localhost', '::1'):
+        print("Yerel olmayan bir adreste dinlemek için --token (veya CONVERTER_JOB_TOKEN) gerekli.",
+              file=sys.stderr)
+        return 1
+    queue = JobQueue(args.db, args.visibility_timeout, args.max_attempts, args.retry_delay)
+    server = make_server(queue, args.host, args.port, args.token, args.roots)
+    url = f"http://{args.host}:{server.server_address[1]}"
+    workers = [Process(target=run_worker, args=(url, f"yerel-{index + 1}"),
+                       kwargs={'token': args.token, 'roots': args.roots}, daemon=True)
+               for index in range(args.local_workers)]
+    for worker in workers:
+        worker.start()
+    print(f"İş sunucusu dinleniyor: {url} ({len(workers)} yerel işçi)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for worker in workers:
+            worker.terminate()
+    return 0
+
+
+def submit(args):
+    target_formats = [normalize_format(f) for f in args.formats]
+    jobs = build_jobs(collect_files(args.inputs, recursive=not args.no_recursive), target_formats, args.output_dir)
+    if not jobs:
+        print("Dönüştürülecek dosya bulunamadı.", file=sys.stderr)
+        return 1
+    options = build_options(args)
+    for source_file, target_files, file_type in jobs:
+        # Sunucu ve işçiler aynı dosya sistemini paylaştığı için mutlak yollar gönderilir
+        response = post_json(f"{args.server.rstrip('/')}/jobs", {
+            'source': str(Path(source_file).resolve()),
+            'targets': [str(Path(target).resolve()) for target in target_files],
+            'file_type': file_type,
+            'options': options,
+            'priority': args.priority
+        }, args.token)
+        print(f"{response['id']}\t{source_file}")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="le1denfrost Format Dönüştürücü - iş sunucusu")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', help="İş kuyruğu sunucusunu başlat")
+    serve_parser.add_argument('--host', default='127.0.0.1', help="Dinlenecek adres")
+    serve_parser.add_argument('--port', type=int, default=8765, help="Dinlenecek port")
+    serve_parser.add_argument('--db', help="İş kuyruğu veritabanı")
+    serve_parser.add_argument('--visibility-timeout', type=float, default=60,
+                              help="Nabız gelmezse kiralamanın düşeceği süre (saniye)")
+    serve_parser.add_argument('--max-attempts', type=int, default=3, help="Bir işin en fazla deneme sayısı")
+    serve_parser.add_argument('--retry-delay', type=float, default=5,
+                              help="Başarısız işin yeniden denenmesi için ilk bekleme (saniye)")
+    serve_parser.add_argument('--local-workers', type=int, default=0,
+                              help="Sunucuyla birlikte başlatılacak yerel işçi sayısı")
+    serve_parser.add_argument('--token', default=os.environ.get('CONVERTER_JOB_TOKEN'),
+                              help="İsteklerde X-Job-Token başlığıyla beklenen paylaşılan gizli anahtar "
+                                   "(varsayılan: CONVERTER_JOB_TOKEN)")
+    serve_parser.add_argument('--root', action='append', dest='roots',
+                              help="Kaynak ve hedef yollarının bulunabileceği klasör (birden çok verilebilir)")
+    submit_parser = commands.add_parser('submit', help="Kuyruğa dönüşüm işleri ekle")
+    submit_parser.add_argument('server', help="Sunucu adresi (örn. http://127.0.0.1:8765)")
+    submit_parser.add_argument('inputs', nargs='+', help="Dönüştürülecek dosyalar veya klasörler")
+    submit_parser.add_argument('-f', '--formats', nargs='+', required=True,
+                               help="Hedef formatlar (örn. .mp3 .ogg .webp)")
+    submit_parser.add_argument('-o', '--output-dir', help="Çıktı klasörü (varsayılan: kaynak dosyanın klasörü)")
+    submit_parser.add_argument('--no-recursive', action='store_true', help="Alt klasörleri tarama")
+    submit_parser.add_argument('--priority', type=int, default=0, help="İş önceliği (büyük olan önce)")
+    submit_parser.add_argument('--token', default=os.environ.get('CONVERTER_JOB_TOKEN'),
+                               help="Sunucunun paylaşılan gizli anahtarı (varsayılan: CONVERTER_JOB_TOKEN)")
+    add_option_arguments(submit_parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return serve(args) if args.command == 'serve' else submit(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
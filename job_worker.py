@@ -0,0 +1,143 @@
+import argparse
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from cache import ConversionCache
+from converter import MediaConverter
+
+
+def auth_headers(token=None):
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['X-Job-Token'] = token
+    return headers
+
+
+def path_allowed(path, roots):
+    if not roots:
+        return True
+    resolved = Path(path).resolve()
+    return any(resolved == root or root in resolved.parents for root in (Path(r).resolve() for r in roots))
+
+
+class JobClient:
+    def __init__(self, server_url, token=None):
+        self.server_url = server_url.rstrip('/')
+        self.token = token
+
+    def request(self, path, payload=None):
+        data = json.dumps(payload).encode() if payload is not None else None
+        request = Request(self.server_url + path, data=data, method='POST' if data is not None else 'GET',
+                          headers=auth_headers(self.token))
+        with urlopen(request, timeout=30) as response:
+            body = response.read()
+        return json.loads(body) if body else None
+
+    def lease(self, worker):
+        return self.request('/lease', {'worker': worker})
+
+    def heartbeat(self, job, progress):
+        return self.request(f"/jobs/{job['id']}/heartbeat", {'lease_token': job['lease_token'], 'progress': progress})
+
+    def complete(self, job, error=None):
+        return self.request(f"/jobs/{job['id']}/complete", {'lease_token': job['lease_token'], 'error': error})
+
+
+def process_job(client, job, cache=None):
+    progress = [0]
+    result = {}
+    converter = MediaConverter(progress_callback=lambda value: progress.__setitem__(0, value),
+                               options=job['options'], cache=cache)
+
+    def convert():
+        try:
+            for target_file in job['targets']:
+                Path(target_file).parent.mkdir(parents=True, exist_ok=True)
+            converter.convert_many(job['source'], job['targets'], job['file_type'])
+        except Exception as e:
+            result['error'] = str(e)
+
+    thread = threading.Thread(target=convert, daemon=True)
+    thread.start()
+    # Kiralama süresinin üçte birinde bir nabız gönderilir
+    interval = max(1, job['visibility_timeout'] / 3)
+    while thread.is_alive():
+        thread.join(interval)
+        if not thread.is_alive():
+            break
+        try:
+            client.heartbeat(job, progress[0])
+        except HTTPError as e:
+            if e.code == 409:
+                # İş iptal edildi veya başka bir işçiye verildi; yarım kalan çıktılar silinir
+                converter.cancel()
+                thread.join()
+                return None
+        except URLError:
+            pass
+    client.complete(job, result.get('error'))
+    return result.get('error')
+
+
+def run_worker(server_url, worker_name=None, poll_interval=2.0, use_cache=True, cache_dir=None, once=False,
+               token=None, roots=None):
+    client = JobClient(server_url, token)
+    worker_name = worker_name or f"{socket.gethostname()}-{threading.get_native_id()}"
+    cache = ConversionCache(cache_dir) if use_cache else None
+    while True:
+        try:
+            job = client.lease(worker_name)
+        except (URLError, ConnectionError) as e:
+            print(f"Sunucuya bağlanılamadı: {e}", file=sys.stderr)
+            job = None
+        if job is None:
+            if once:
+                return
+            time.sleep(poll_interval)
+            continue
+        try:
+            # Sunucu ele geçirilse bile işçi yalnızca izin verilen klasörlerdeki dosyalara dokunur
+            if not all(path_allowed(path, roots) for path in [job['source']] + job['targets']):
+                error = "Dosya yolu işçinin izin verilen klasörlerinin dışında."
+                client.complete(job, error)
+            else:
+                error = process_job(client, job, cache)
+        except (HTTPError, URLError) as e:
+            print(f"HATA  iş {job['id']}: sunucuya sonuç bildirilemedi: {e}", file=sys.stderr)
+            continue
+        if error:
+            print(f"HATA  iş {job['id']} {job['source']}: {error}", file=sys.stderr)
+        else:
+            print(f"OK    iş {job['id']} {job['source']} -> {', '.join(job['targets'])}", flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="le1denfrost Format Dönüştürücü - iş sunucusu işçisi")
+    parser.add_argument('server', help="Sunucu adresi (örn. http://127.0.0.1:8765)")
+    parser.add_argument('--name', help="İşçi adı (varsayılan: makine adı ve süreç numarası)")
+    parser.add_argument('--poll-interval', type=float, default=2.0, help="Kuyruk boşken bekleme süresi (saniye)")
+    parser.add_argument('--once', action='store_true', help="Kuyruk boşalınca çık")
+    parser.add_argument('--cache-dir', help="Dönüşüm önbelleği klasörü")
+    parser.add_argument('--no-cache', action='store_true', help="Dönüşüm önbelleğini kullanma")
+    parser.add_argument('--token', default=os.environ.get('CONVERTER_JOB_TOKEN'),
+                        help="Sunucunun paylaşılan gizli anahtarı (varsayılan: CONVERTER_JOB_TOKEN)")
+    parser.add_argument('--root', action='append', dest='roots',
+                        help="İşlerin okuyup yazabileceği klasör (birden çok verilebilir)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    run_worker(args.server, args.name, args.poll_interval, not args.no_cache, args.cache_dir, args.once,
+               args.token, args.roots)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
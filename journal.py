@@ -0,0 +1,64 @@
+import json
+import os
+import time
+from pathlib import Path
+from cache import file_digest
+from file_utils import sqlite_connect
+
+
+class BatchJournal:
+    def __init__(self, journal_path):
+        self.journal_path = Path(journal_path)
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS jobs (source TEXT, targets TEXT, size INTEGER, mtime_ns INTEGER, '
+                       'state TEXT, error TEXT, outputs TEXT, updated REAL, PRIMARY KEY (source, targets))')
+
+    def connect(self):
+        return sqlite_connect(self.journal_path)
+
+    def job_key(self, job):
+        source_file, target_files, _ = job
+        return str(Path(source_file).resolve()), json.dumps([str(Path(target).resolve()) for target in target_files])
+
+    def is_complete(self, job, verify=False):
+        with self.connect() as db:
+            row = db.execute('SELECT size, mtime_ns, state, outputs FROM jobs WHERE source = ? AND targets = ?',
+                             self.job_key(job)).fetchone()
+        if row is None or row[2] != 'done':
+            return False
+        try:
+            stat = os.stat(job[0])
+        except OSError:
+            return False
+        if (stat.st_size, stat.st_mtime_ns) != tuple(row[:2]):
+            return False
+        # Çıktılar boyutlarıyla, --verify verilirse SHA-256 özetleriyle doğrulanır
+        for target_file, (size, digest) in json.loads(row[3]).items():
+            try:
+                if os.path.getsize(target_file) != size:
+                    return False
+                if verify and file_digest(target_file) != digest:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def record(self, job, state, error=None, outputs=None):
+        try:
+            stat = os.stat(job[0])
+            signature = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            signature = (None, None)
+        with self.connect() as db:
+            db.execute('INSERT OR REPLACE INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                       self.job_key(job) + signature + (state, error, json.dumps(outputs or {}), time.time()))
+
+    def summary(self):
+        with self.connect() as db:
+            return dict(db.execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+
+
+def output_checksums(target_files):
+    return {str(Path(target_file).resolve()): (os.path.getsize(target_file), file_digest(target_file))
+            for target_file in target_files}
@@ -0,0 +1,132 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def maxrss_kb(rusage):
+    return rusage.ru_maxrss // 1024 if sys.platform == 'darwin' else rusage.ru_maxrss
+
+
+def process_peak_rss_kb():
+    # Sürecin ömrü boyunca görülen en yüksek değerlerdir; aynı süreçte çalışan önceki işleri de kapsar
+    try:
+        import resource
+    except ImportError:
+        return None, None
+    return (maxrss_kb(resource.getrusage(resource.RUSAGE_SELF)),
+            maxrss_kb(resource.getrusage(resource.RUSAGE_CHILDREN)))
+
+
+def current_rss_kb():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class ProgressThrottle:
+    def __init__(self, callback, min_interval=0.1):
+        self.callback = callback
+        self.min_interval = min_interval
+        self.last_value = None
+        self.last_time = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, value):
+        with self.lock:
+            now = time.monotonic()
+            if value == self.last_value:
+                return
+            if value not in (0, 100) and now - self.last_time < self.min_interval:
+                return
+            self.last_value = value
+            self.last_time = now
+        self.callback(value)
+
+
+class JobMetrics:
+    def __init__(self, source_path=None, file_type=None, event_callback=None):
+        self.source_path = str(source_path) if source_path else None
+        self.file_type = file_type
+        self.event_callback = event_callback
+        self.backend = None
+        self.bytes_in = os.path.getsize(source_path) if source_path else 0
+        self.bytes_out = 0
+        self.stages = []
+        self.open_stages = {}
+        self.child_peak_rss = None
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def emit(self, event, **fields):
+        if self.event_callback is not None:
+            self.event_callback(dict(event=event, source=self.source_path, time=time.time(), **fields))
+
+    @contextmanager
+    def stage(self, name):
+        self.emit('stage_start', stage=name)
+        start = time.perf_counter()
+        start_rss = current_rss_kb()
+        record = {'stage': name, 'peak_child_rss_kb': None}
+        with self.lock:
+            # Aynı adlı aşamalar farklı iş parçacıklarında eşzamanlı açılabilir; kayıtlar kimlikleriyle tutulur
+            self.open_stages[id(record)] = record
+        try:
+            yield
+        finally:
+            rss = current_rss_kb()
+            with self.lock:
+                del self.open_stages[id(record)]
+                record.update({
+                    'duration': time.perf_counter() - start,
+                    'rss_kb': rss,
+                    'rss_delta_kb': rss - start_rss if rss is not None and start_rss is not None else None
+                })
+                self.stages.append(record)
+            self.emit('stage_end', **record)
+
+    def child_finished(self, rusage):
+        # ffmpeg alt süreçlerinin tepe belleği os.wait4 ile her süreç için ayrı okunur
+        peak = maxrss_kb(rusage)
+        with self.lock:
+            self.child_peak_rss = max(self.child_peak_rss or 0, peak)
+            for record in self.open_stages.values():
+                record['peak_child_rss_kb'] = max(record['peak_child_rss_kb'] or 0, peak)
+
+    def set_backend(self, backend):
+        self.backend = backend
+        self.emit('backend', backend=backend)
+
+    def finish(self, target_paths, error=None):
+        self.bytes_out = sum(os.path.getsize(path) for path in target_paths if os.path.exists(path))
+        self.emit('job', **self.to_dict(), error=error)
+
+    def to_dict(self):
+        process_peak_rss, _ = process_peak_rss_kb()
+        return {
+            'file_type': self.file_type,
+            'backend': self.backend,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+            'wall_time': time.perf_counter() - self.started,
+            'rss_kb': current_rss_kb(),
+            'peak_child_rss_kb': self.child_peak_rss,
+            'process_peak_rss_kb': process_peak_rss,
+            'stages': list(self.stages)
+        }
+
+
+class JsonLinesLog:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        line = json.dumps(event, default=str) + '\n'
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
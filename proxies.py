@@ -0,0 +1,91 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from cache import default_cache_dir
+from file_utils import atomic_path, prune_directory, touch
+from ffmpeg_utils import has_encoder, media_duration, probe_media, require_ffmpeg, run_ffmpeg
+
+
+PROXY_HEIGHT = 360
+SPRITE_TILE = (160, 90)
+SPRITE_GRID = (10, 10)
+DEFAULT_MAX_SIZE = 1024 ** 3
+
+
+def proxy_encoder_args():
+    if has_encoder('libx264'):
+        return ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '30', '-pix_fmt', 'yuv420p']
+    return ['-c:v', 'mpeg4', '-q:v', '8']
+
+
+class ProxyCache:
+    def __init__(self, cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / 'proxies'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.lock = threading.Lock()
+
+    def make_key(self, file_path):
+        stat = os.stat(file_path)
+        key_source = f"{Path(file_path).resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{PROXY_HEIGHT}|{SPRITE_TILE}"
+        return hashlib.sha1(key_source.encode()).hexdigest()
+
+    def cached(self, file_path):
+        key = self.make_key(file_path)
+        proxy_path = self.cache_dir / f"{key}.mp4"
+        if not proxy_path.exists():
+            return None, None
+        return touch(proxy_path), self.load_sprite(key)
+
+    def load_sprite(self, key):
+        info_path = self.cache_dir / f"{key}.json"
+        if not info_path.exists():
+            return None
+        # Bilgi dosyası da tazelenir; aksi halde temizlikte önce o silinir ve şerit kaybolur
+        info = json.loads(touch(info_path).read_text(encoding='utf-8'))
+        info['path'] = str(touch(self.cache_dir / f"{key}.jpg"))
+        return info
+
+    def get(self, file_path):
+        proxy_path, sprite = self.cached(file_path)
+        if proxy_path is not None:
+            return proxy_path, sprite
+        require_ffmpeg()
+        key = self.make_key(file_path)
+        proxy_path = self.cache_dir / f"{key}.mp4"
+        self.create_proxy(file_path, proxy_path)
+        duration = media_duration(probe_media(file_path))
+        if duration:
+            sprite = self.create_sprite(file_path, key, duration)
+        self.prune()
+        return proxy_path, sprite
+
+    def create_proxy(self, file_path, proxy_path):
+        with atomic_path(proxy_path) as temp_path:
+            run_ffmpeg(['-i', file_path, '-map', '0:v:0', '-map', '0:a:0?',
+                        '-vf', f"scale=-2:'min({PROXY_HEIGHT},ih)'"] + proxy_encoder_args()
+                       + ['-c:a', 'aac', '-b:a', '96k', '-ac', '2', '-movflags', '+faststart', temp_path])
+
+    def create_sprite(self, file_path, key, duration):
+        columns, rows = SPRITE_GRID
+        tile_width, tile_height = SPRITE_TILE
+        interval = duration / (columns * rows)
+        sprite_path = self.cache_dir / f"{key}.jpg"
+        # Yalnızca anahtar kareler çözülür; fps süzgeci bunları eşit aralıklı karelere yerleştirir
+        filters = (f"fps=1/{interval:.6f},"
+                   f"scale={tile_width}:{tile_height}:force_original_aspect_ratio=decrease,"
+                   f"pad={tile_width}:{tile_height}:(ow-iw)/2:(oh-ih)/2,tile={columns}x{rows}")
+        with atomic_path(sprite_path) as temp_path:
+            run_ffmpeg(['-skip_frame', 'nokey', '-i', file_path, '-an', '-vf', filters,
+                        '-frames:v', '1', '-q:v', '5', temp_path])
+        info = {'columns': columns, 'rows': rows, 'tile_width': tile_width, 'tile_height': tile_height,
+                'interval': interval, 'count': columns * rows}
+        (self.cache_dir / f"{key}.json").write_text(json.dumps(info), encoding='utf-8')
+        info['path'] = str(sprite_path)
+        return info
+
+    def prune(self):
+        with self.lock:
+            prune_directory(self.cache_dir, self.max_size)
@@ -0,0 +1,70 @@
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from PIL import Image, ImageChops, ImageStat
+
+
+QUALITY_RANGES = {'JPEG': (1, 95), 'WEBP': (1, 100), 'AVIF': (1, 100)}
+
+
+def encode(img, format_name, quality, params):
+    buffer = BytesIO()
+    img.save(buffer, format=format_name, **dict(params, quality=quality))
+    return buffer.getvalue()
+
+
+def psnr(reference, data):
+    decoded = Image.open(BytesIO(data)).convert(reference.mode)
+    squares = ImageStat.Stat(ImageChops.difference(reference, decoded)).sum2
+    mse = sum(squares) / (len(squares) * reference.width * reference.height)
+    return float('inf') if mse == 0 else 10 * math.log10(255 ** 2 / mse)
+
+
+def candidates(low, high, count):
+    if high - low + 1 <= count:
+        return list(range(low, high + 1))
+    return sorted({round(low + (high - low) * (i + 1) / (count + 1)) for i in range(count)})
+
+
+def search_quality(img, format_name, params=None, target_size=None, target_psnr=None, workers=None):
+    params = dict(params or {})
+    params.pop('quality', None)
+    reference = img.convert('RGBA' if 'A' in img.getbands() else 'RGB') if target_psnr else None
+    workers = workers or min(4, os.cpu_count() or 1)
+    low, high = QUALITY_RANGES[format_name]
+    results = {}
+    best = None
+
+    def trial(quality):
+        # save() parametreleri görüntünün encoderinfo alanına yazar; paralel denemeler kendi kopyalarını kullanır
+        data = encode(img.copy(), format_name, quality, params)
+        return quality, data, psnr(reference, data) if target_psnr else None
+
+    def passes(quality):
+        size, score = results[quality]
+        return size <= target_size if target_size else score >= target_psnr
+
+    # Boyut hedefinde uygun kaliteler aralığın alt ucunda, PSNR hedefinde üst ucundadır.
+    # Her turda aralık paralel denemelerle bölünür; yalnızca en iyi çıktı bellekte tutulur.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        while low <= high:
+            qualities = candidates(low, high, workers)
+            for quality, data, score in executor.map(trial, qualities):
+                results[quality] = (len(data), score)
+                if passes(quality):
+                    if best is None or (quality > best[0] if target_size else quality < best[0]):
+                        best = (quality, data)
+            passing = [q for q in qualities if passes(q)]
+            failing = [q for q in qualities if not passes(q)]
+            if target_size:
+                low = max(passing, default=low - 1) + 1
+                high = min([q for q in failing if q >= low], default=high + 1) - 1
+            else:
+                high = min(passing, default=high + 1) - 1
+                low = max([q for q in failing if q <= high], default=low - 1) + 1
+    if best is None:
+        # Hedefe ulaşılamazsa en yakın sonuç (en küçük dosya veya en yüksek kalite) kullanılır
+        quality = min(results) if target_size else max(results)
+        best = (quality, encode(img, format_name, quality, params))
+    return best
@@ -0,0 +1,49 @@
+import os
+
+
+MB = 1024 ** 2
+
+# Dosya türü başına (cpu payı, sabit bellek tahmini)
+JOB_COSTS = {
+    'resim': (1, 64 * MB),
+    'ses': (1, 64 * MB),
+    'video': (max(2, (os.cpu_count() or 2) // 2), 512 * MB)
+}
+
+
+def total_memory():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (AttributeError, ValueError, OSError):
+        return 8 * 1024 ** 3
+
+
+def estimate_cost(file_path, file_type):
+    cpu, memory = JOB_COSTS.get(file_type, (1, 64 * MB))
+    if file_type == 'resim':
+        # Sıkıştırılmış resimler açıldığında kabaca dosya boyutunun on katı yer kaplar
+        try:
+            memory = max(memory, os.path.getsize(file_path) * 10)
+        except OSError:
+            pass
+    return cpu, memory
+
+
+class ResourceBudget:
+    def __init__(self, cpu=None, memory=None):
+        self.cpu = cpu or os.cpu_count() or 1
+        self.memory = memory or total_memory() // 2
+        self.cpu_used = 0
+        self.memory_used = 0
+
+    def fits(self, cost):
+        cpu, memory = cost
+        return self.cpu_used + cpu <= self.cpu and self.memory_used + memory <= self.memory
+
+    def acquire(self, cost):
+        self.cpu_used += cost[0]
+        self.memory_used += cost[1]
+
+    def release(self, cost):
+        self.cpu_used -= cost[0]
+        self.memory_used -= cost[1]
@@ -0,0 +1,50 @@
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from svglib.svglib import svg2rlg
+from reportlab.graphics import renderPM
+from reportlab.graphics.shapes import Drawing, Group
+
+
+MAX_CACHED_DRAWINGS = 256
+
+_drawing_lock = threading.Lock()
+_drawings = OrderedDict()
+
+
+def load_drawing(file_path):
+    stat = os.stat(file_path)
+    key = (str(Path(file_path).resolve()), stat.st_size, stat.st_mtime_ns)
+    with _drawing_lock:
+        if key in _drawings:
+            _drawings.move_to_end(key)
+            return _drawings[key]
+    drawing = svg2rlg(str(file_path))
+    if drawing is None:
+        raise Exception("SVG dosyası okunamadı.")
+    with _drawing_lock:
+        _drawings[key] = drawing
+        while len(_drawings) > MAX_CACHED_DRAWINGS:
+            _drawings.popitem(last=False)
+    return drawing
+
+
+def rasterize_svg(file_path, width=None, height=None, dpi=None):
+    drawing = load_drawing(file_path)
+    if width and height:
+        scale_x = scale_y = min(width / drawing.width, height / drawing.height)
+    elif width:
+        scale_x = scale_y = width / drawing.width
+    elif height:
+        scale_x = scale_y = height / drawing.height
+    elif dpi:
+        scale_x = scale_y = dpi / 72
+    else:
+        scale_x = scale_y = 1
+    # Önbellekteki çizim değiştirilmez; ölçek yeni bir grup üzerinden uygulanır
+    scaled = Drawing(round(drawing.width * scale_x), round(drawing.height * scale_y))
+    group = Group(*drawing.contents)
+    group.scale(scale_x, scale_y)
+    scaled.add(group)
+    return renderPM.drawToPIL(scaled, dpi=72)
@@ -0,0 +1,26 @@
+import numpy as np
+from audio_transform import Resampler, transform
+
+
+def sine(rate, seconds, frequency=1000):
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)[:, None]
+
+
+def test_resample_matches_reference_sine():
+    source = sine(44100, 2)
+    blocks = [source[i:i + 10000] for i in range(0, len(source), 10000)]
+    output = np.concatenate(list(transform(iter(blocks), 44100, 48000, 1)))
+    assert len(output) == 96000
+    expected = sine(48000, 2)
+    assert np.abs(output[1000:-1000] - expected[1000:-1000]).max() < 1e-4
+
+
+def test_resampler_accepts_tiny_blocks():
+    source = sine(48000, 0.1)
+    resampler = Resampler(48000, 22050, 1)
+    parts = [resampler.process(source[i:i + 7]) for i in range(0, len(source), 7)]
+    parts.append(resampler.process(np.zeros((0, 1), dtype=np.float32), final=True))
+    output = np.concatenate(parts)
+    assert len(output) == 2205
+    assert np.abs(output[200:-200] - sine(22050, 0.1)[200:-200]).max() < 1e-4
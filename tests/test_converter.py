@@ -0,0 +1,16 @@
+from PIL import Image
+from converter import MediaConverter
+
+
+def test_convert_image_to_many_targets(tmp_path):
+    source = tmp_path / 'n.png'
+    Image.effect_noise((256, 256), 64).convert('RGB').save(source)
+    targets = [tmp_path / name for name in ['r1.webp', 'r2.jpg', 'r3.bmp', 'r4.tiff']]
+    for _ in range(5):
+        events = []
+        converter = MediaConverter(event_callback=events.append)
+        converter.convert_many(source, targets, 'resim')
+        for target in targets:
+            with Image.open(target) as img:
+                assert img.size == (256, 256)
+        assert not [event for event in events if event['event'] == 'job' and event['error']]
@@ -0,0 +1,17 @@
+import random
+from PIL import Image
+from quality_search import encode, search_quality
+
+
+def noisy_image(width=1600, height=1200):
+    rng = random.Random(0)
+    noise = Image.frombytes('RGB', (width, height), rng.randbytes(width * height * 3))
+    return Image.blend(Image.radial_gradient('L').resize((width, height)).convert('RGB'), noise, 0.3)
+
+
+def test_search_returns_bytes_of_chosen_quality():
+    img = noisy_image()
+    quality, data = search_quality(img, 'JPEG', target_size=400000, workers=4)
+    assert data == encode(noisy_image(), 'JPEG', quality, {})
+    assert len(data) <= 400000
+    assert len(encode(noisy_image(), 'JPEG', quality + 1, {})) > 400000
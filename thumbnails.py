@@ -0,0 +1,74 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+from pathlib import Path
+from backends import lazy_import
+from cache import default_cache_dir
+from file_utils import atomic_path, prune_directory, touch
+
+Image = lazy_import('PIL.Image')
+svg_raster = lazy_import('svg_raster')
+
+
+PREVIEW_SIZE = (401, 301)
+DEFAULT_MAX_SIZE = 256 * 1024 ** 2
+
+
+def encode_thumbnail(img):
+    if img.mode not in ['RGB', 'RGBA']:
+        img = img.convert('RGBA')
+    buffer = BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def render_thumbnail(file_path, size=PREVIEW_SIZE):
+    if Path(file_path).suffix.lower() == '.svg':
+        return encode_thumbnail(svg_raster.rasterize_svg(file_path, width=size[0], height=size[1]))
+    with Image.open(file_path) as img:
+        # JPEG gibi formatlarda DCT ölçekleme ile doğrudan küçük boyutta çözülür
+        img.draft('RGB', size)
+        img.thumbnail(size, Image.LANCZOS, reducing_gap=2.0)
+        return encode_thumbnail(img)
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir=None, memory_items=64, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = Path(cache_dir) if cache_dir else default_cache_dir() / 'thumbnails'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.memory_items = memory_items
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+    def make_key(self, file_path, size):
+        stat = os.stat(file_path)
+        key_source = f"{Path(file_path).resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{size[0]}x{size[1]}"
+        return hashlib.sha1(key_source.encode()).hexdigest()
+
+    def get(self, file_path, size=PREVIEW_SIZE):
+        key = self.make_key(file_path, size)
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+        disk_path = self.cache_dir / f"{key}.png"
+        if disk_path.exists():
+            data = touch(disk_path).read_bytes()
+        else:
+            data = render_thumbnail(file_path, size)
+            with atomic_path(disk_path) as temp_path:
+                temp_path.write_bytes(data)
+            self.prune()
+        with self.lock:
+            self.memory[key] = data
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+        return data
+
+    def prune(self):
+        with self.lock:
+            prune_directory(self.cache_dir, self.max_size)
@@ -0,0 +1,195 @@
+import argparse
+import json
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from batch import add_conversion_arguments, build_cache, build_jobs, build_options, run_job
+from cache import default_cache_dir
+from converter import normalize_format
+from file_utils import sqlite_connect
+
+
+class WatchState:
+    def __init__(self, state_path=None):
+        self.state_path = Path(state_path) if state_path else default_cache_dir() / 'watch.db'
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as db:
+            db.execute('CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, '
+                       'status TEXT, error TEXT, updated REAL)')
+            # Taramada dosya başına sorgu yapılmaz; durum bir kez belleğe alınır (yazan tek süreç izleyicidir)
+            self.files = {row[0]: (row[1], row[2], row[3])
+                          for row in db.execute('SELECT path, size, mtime_ns, status FROM files')}
+
+    def connect(self):
+        return sqlite_connect(self.state_path)
+
+    def key(self, path):
+        # Göreli kök, sembolik bağlantı veya farklı yazımla gelen aynı dosya tek kayıt olarak tutulur
+        return str(Path(path).resolve())
+
+    def is_handled(self, path, signature):
+        # Yarıda kalan ('running') işler yeniden başlatmada tekrar kuyruğa alınır
+        row = self.files.get(self.key(path))
+        return row is not None and tuple(row[:2]) == signature and row[2] != 'running'
+
+    def mark(self, path, signature, status, error=None):
+        key = self.key(path)
+        with self.connect() as db:
+            db.execute('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)',
+                       (key, signature[0], signature[1], status, error, time.time()))
+        self.files[key] = (signature[0], signature[1], status)
+
+
+class WatchRule:
+    def __init__(self, input_dir, formats, output_dir=None, recursive=True):
+        self.input_dir = Path(input_dir)
+        self.formats = [normalize_format(f) for f in formats]
+        self.output_dir = Path(output_dir) if output_dir else None
+        self.recursive = recursive
+
+    def scan(self):
+        pattern = '**/*' if self.recursive else '*'
+        for path in self.input_dir.glob(pattern):
+            if path.name.startswith('.') or path.stem.endswith('_converted'):
+                continue
+            if self.output_dir and self.output_dir in path.parents:
+                continue
+            if path.is_file():
+                yield path
+
+
+class FolderWatcher:
+    def __init__(self, rules, state, workers=None, options=None, cache_settings=None, metrics_log=None,
+                 poll_interval=2.0, settle_time=5.0):
+        self.rules = rules
+        self.state = state
+        self.workers = workers or 1
+        self.options = options
+        self.cache_settings = cache_settings
+        self.metrics_log = metrics_log
+        self.poll_interval = poll_interval
+        self.settle_time = settle_time
+        self.pending = {}
+        self.running = {}
+        self.stopped = False
+
+    def stop(self, *_):
+        self.stopped = True
+
+    def poll(self):
+        now = time.monotonic()
+        ready = []
+        for rule in self.rules:
+            for path in rule.scan():
+                if path in self.running:
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                signature = (stat.st_size, stat.st_mtime_ns)
+                seen = self.pending.get(path)
+                if seen is None or seen[0] != signature:
+                    # Yazılmakta olan dosyalar boyutu ve zamanı sabitlenene kadar bekletilir
+                    if not self.state.is_handled(path, signature):
+                        self.pending[path] = (signature, now, rule)
+                elif now - seen[1] >= self.settle_time:
+                    ready.append(path)
+        return ready
+
+    def submit(self, executor, path):
+        signature, _, rule = self.pending.pop(path)
+        jobs = build_jobs([(path, rule.input_dir)], rule.formats, rule.output_dir)
+        if not jobs:
+            self.state.mark(path, signature, 'skipped')
+            return
+        self.state.mark(path, signature, 'running')
+        future = executor.submit(run_job, jobs[0], self.options, self.cache_settings, self.metrics_log)
+        self.running[path] = (future, signature)
+
+    def collect(self, done):
+        for path, (future, signature) in list(self.running.items()):
+            if future not in done:
+                continue
+            del self.running[path]
+            try:
+                source_file, target_files, error, _ = future.result()
+            except Exception as e:
+                source_file, target_files, error = str(path), [], str(e)
+            if error and self.stopped:
+                # Kapanışta ffmpeg de sinyali aldığından hata kaydedilmez; iş 'running' kalır ve
+                # yeniden başlatmada tekrar kuyruğa alınır
+                print(f"YARIDA  {source_file}: {error}", file=sys.stderr)
+            elif error:
+                print(f"HATA  {source_file}: {error}", file=sys.stderr)
+                self.state.mark(path, signature, 'failed', error)
+            else:
+                print(f"OK    {source_file} -> {', '.join(target_files)}", flush=True)
+                self.state.mark(path, signature, 'done')
+
+    def run(self):
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            while not self.stopped:
+                for path in self.poll():
+                    if len(self.running) >= self.workers:
+                        break
+                    self.submit(executor, path)
+                futures = [future for future, _ in self.running.values()]
+                if futures:
+                    done, _ = wait(futures, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+                    self.collect(done)
+                else:
+                    time.sleep(self.poll_interval)
+            # Çalışan işler bitirilir; bekleyenler bir sonraki açılışta yeniden taranır
+            self.collect(set(wait([future for future, _ in self.running.values()])[0]))
+
+
+def load_rules(config_path):
+    with open(config_path, encoding='utf-8') as f:
+        config = json.load(f)
+    return [WatchRule(folder['input'], folder['formats'], folder.get('output_dir'), folder.get('recursive', True))
+            for folder in config['folders']]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="le1denfrost Format Dönüştürücü - klasör izleme")
+    parser.add_argument('inputs', nargs='*', help="İzlenecek klasörler")
+    parser.add_argument('-f', '--formats', nargs='+', help="Hedef formatlar (örn. .mp3 .ogg .webp)")
+    parser.add_argument('-o', '--output-dir', help="Çıktı klasörü (varsayılan: kaynak dosyanın klasörü)")
+    parser.add_argument('--no-recursive', action='store_true', help="Alt klasörleri tarama")
+    parser.add_argument('--config', help="Klasör kurallarını içeren JSON dosyası")
+    parser.add_argument('--state', help="Tamamlanan dosyaların kaydedileceği veritabanı")
+    parser.add_argument('--poll-interval', type=float, default=2.0, help="Tarama aralığı (saniye)")
+    parser.add_argument('--settle-time', type=float, default=5.0,
+                        help="Dosyanın işlenmeden önce değişmeden kalması gereken süre (saniye)")
+    add_conversion_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rules = load_rules(args.config) if args.config else []
+    if args.inputs:
+        if not args.formats:
+            print("Klasörler için hedef formatlar (-f) belirtilmeli.", file=sys.stderr)
+            return 1
+        rules += [WatchRule(folder, args.formats, args.output_dir, not args.no_recursive) for folder in args.inputs]
+    if not rules:
+        print("İzlenecek klasör belirtilmedi.", file=sys.stderr)
+        return 1
+    _, cache_settings = build_cache(args)
+    watcher = FolderWatcher(rules, WatchState(args.state), workers=args.jobs, options=build_options(args),
+                            cache_settings=cache_settings, metrics_log=args.metrics_log,
+                            poll_interval=args.poll_interval, settle_time=args.settle_time)
+    signal.signal(signal.SIGTERM, watcher.stop)
+    signal.signal(signal.SIGINT, watcher.stop)
+    for rule in rules:
+        print(f"İzleniyor: {rule.input_dir} -> {', '.join(rule.formats)}", flush=True)
+    watcher.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())